@@ -5,32 +5,49 @@ Focus: Scholarly Communication & Technical Documentation
 """
 
 import os
-from crewai import Agent, LLM
-from crewai_tools import FileWriterTool
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Agent, LLM
 
 # --- Configuration & Environment Management ---
 # Optimized for clarity, precision, and publication-grade output generation.
 WRITER_MODEL = os.getenv("WRITER_AGENT_LLM", "gpt-4")
 CREATIVE_TEMPERATURE = float(os.getenv("WRITER_AGENT_TEMPERATURE", 0.4))
+# Token streaming lets clients read the draft live via /api/research/stream/<research_id>
+WRITER_STREAM = os.getenv("WRITER_AGENT_STREAM", "true").lower() == "true"
+
+# --- Lazy LLM Client ---
+# Built on first use so importing this module never loads crewai/litellm (keeps API startup fast).
+@lru_cache(maxsize=None)
+def get_publication_llm() -> "LLM":
+    from crewai import LLM
+    from orchestration.cache_adapters import with_llm_cache, with_rate_limit
+    return with_llm_cache(with_rate_limit(LLM(
+        model=WRITER_MODEL,
+        temperature=CREATIVE_TEMPERATURE,
+        stream=WRITER_STREAM
+    )))
 
-publication_llm = LLM(
-    model=WRITER_MODEL,
-    temperature=CREATIVE_TEMPERATURE
-)
+# --- Agent Factory ---
+# Writes are confined to the run's output directory so parallel manuscripts never overwrite each other.
+def create_content_writer_agent(output_dir: str) -> "Agent":
+    from crewai import Agent
+    from crewai_tools import FileWriterTool
 
-# --- Agent Definition ---
-content_writer_agent = Agent(
-    role="Technical Research Communicator",
-    goal="Produce publication-ready manuscripts adhering to academic standards (APA/IEEE) with executive-level clarity.",
-    backstory=(
-        "You are a Distinguished Technical Writer with a background in both peer-reviewed academic publishing "
-        "and enterprise-grade documentation. Your work has appeared in top-tier journals and industry white papers. "
-        "You excel at translating dense analytical findings into accessible narratives without sacrificing rigor. "
-        "Your writing balances precision, coherence, and rhetorical impact—ensuring that complex insights are "
-        "communicated with both scholarly integrity and strategic clarity."
-    ),
-    llm=publication_llm,
-    tools=[FileWriterTool()],
-    verbose=True,
-    allow_delegation=False  # Maintains authorial voice consistency
-)
\ No newline at end of file
+    return Agent(
+        role="Technical Research Communicator",
+        goal="Produce publication-ready manuscripts adhering to academic standards (APA/IEEE) with executive-level clarity.",
+        backstory=(
+            "You are a Distinguished Technical Writer with a background in both peer-reviewed academic publishing "
+            "and enterprise-grade documentation. Your work has appeared in top-tier journals and industry white papers. "
+            "You excel at translating dense analytical findings into accessible narratives without sacrificing rigor. "
+            "Your writing balances precision, coherence, and rhetorical impact—ensuring that complex insights are "
+            "communicated with both scholarly integrity and strategic clarity."
+        ),
+        llm=get_publication_llm(),
+        tools=[FileWriterTool(base_dir=output_dir)],
+        verbose=True,
+        allow_delegation=False  # Maintains authorial voice consistency
+    )
\ No newline at end of file
@@ -5,31 +5,48 @@ Focus: Statistical Synthesis & Pattern Recognition
 """
 
 import os
-from crewai import Agent, LLM
-from crewai_tools import FileReadTool
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Agent, LLM
 
 # --- Configuration & Environment Management ---
 # Leveraging environment-driven configuration for analytical precision and reproducibility.
 ANALYST_MODEL = os.getenv("ANALYST_AGENT_LLM", "gpt-4")
 ANALYTICAL_TEMPERATURE = float(os.getenv("ANALYST_AGENT_TEMPERATURE", 0.3))
+# Off by default: intermediate synthesis is rarely worth watching live, unlike the manuscript
+ANALYST_STREAM = os.getenv("ANALYST_AGENT_STREAM", "false").lower() == "true"
+
+# --- Lazy LLM Client ---
+# Built on first use so importing this module never loads crewai/litellm (keeps API startup fast).
+@lru_cache(maxsize=None)
+def get_analytical_llm() -> "LLM":
+    from crewai import LLM
+    from orchestration.cache_adapters import with_llm_cache, with_rate_limit
+    return with_llm_cache(with_rate_limit(LLM(
+        model=ANALYST_MODEL,
+        temperature=ANALYTICAL_TEMPERATURE,
+        stream=ANALYST_STREAM
+    )))
 
-analytical_llm = LLM(
-    model=ANALYST_MODEL,
-    temperature=ANALYTICAL_TEMPERATURE
-)
+# --- Agent Factory ---
+# File access is scoped to the run's output directory so analysts only ingest their own research artifacts.
+def create_data_analyst_agent(output_dir: str) -> "Agent":
+    from crewai import Agent
+    from crewai_tools import FileReadTool
 
-# --- Agent Definition ---
-data_analyst_agent = Agent(
-    role="Senior Quantitative Analyst",
-    goal="Synthesize multi-source data into statistically significant insights with causal inference validation.",
-    backstory=(
-        "You are a Principal Data Scientist with dual expertise in computational statistics and domain research. "
-        "Your analytical framework integrates Bayesian reasoning, meta-analytical techniques, and systematic review "
-        "protocols. You transform raw research artifacts into structured knowledge graphs, identifying latent patterns, "
-        "contradictions, and emergent themes with rigorous methodological transparency."
-    ),
-    llm=analytical_llm,
-    tools=[FileReadTool()],
-    verbose=True,
-    allow_delegation=False  # Ensures focused analytical integrity
-)
\ No newline at end of file
+    return Agent(
+        role="Senior Quantitative Analyst",
+        goal="Synthesize multi-source data into statistically significant insights with causal inference validation.",
+        backstory=(
+            "You are a Principal Data Scientist with dual expertise in computational statistics and domain research. "
+            "Your analytical framework integrates Bayesian reasoning, meta-analytical techniques, and systematic review "
+            "protocols. You transform raw research artifacts into structured knowledge graphs, identifying latent patterns, "
+            "contradictions, and emergent themes with rigorous methodological transparency."
+        ),
+        llm=get_analytical_llm(),
+        tools=[FileReadTool(base_dir=output_dir)],
+        verbose=True,
+        allow_delegation=False  # Ensures focused analytical integrity
+    )
\ No newline at end of file
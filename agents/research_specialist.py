@@ -5,31 +5,51 @@ Focus: Methodological Data Acquisition & Empirical Validation
 """
 
 import os
-from crewai import Agent, LLM
-from crewai_tools import SerperDevTool
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from crewai import Agent, LLM
 
 # --- Configuration & Environment Management ---
 # Utilizing environment-specific LLM parameters for reproducibility and modularity.
 MODEL_NAME = os.getenv("RESEARCH_AGENT_LLM", "gpt-4")
 CORE_TEMPERATURE = float(os.getenv("RESEARCH_AGENT_TEMPERATURE", 0.2))
 
-academic_llm = LLM(
-    model=MODEL_NAME,
-    temperature=CORE_TEMPERATURE
-)
+# --- Lazy LLM Client ---
+# Built on first use so importing this module never loads crewai/litellm (keeps API startup fast).
+@lru_cache(maxsize=None)
+def get_academic_llm() -> "LLM":
+    from crewai import LLM
+    from orchestration.cache_adapters import with_llm_cache, with_rate_limit
+    return with_llm_cache(with_rate_limit(LLM(
+        model=MODEL_NAME,
+        temperature=CORE_TEMPERATURE
+    )))
+
+# --- Agent Factory ---
+# Each research run receives its own Agent instance so concurrent crews never share mutable state.
+# Refresh runs restrict its searches to material published after the prior run, minus sources already cited.
+def create_research_specialist_agent(
+    published_after: Optional[date] = None,
+    exclude_links: Iterable[str] = ()
+) -> "Agent":
+    from crewai import Agent
+    from orchestration.cache_adapters import CachedSerperDevTool
 
-# --- Agent Definition ---
-research_specialist_agent = Agent(
-    role="Lead Research Methodologist",
-    goal="Execute high-fidelity data acquisition and cross-verify empirical evidence across global repositories.",
-    backstory=(
-        "You are a Distinguished Research Fellow with a specialization in systemic information retrieval. "
-        "Your expertise lies in discerning high-impact academic journals, trade publications, and authoritative "
-        "digital archives. You prioritize methodological transparency and source credibility above all, "
-        "ensuring that only the most robust data enters the research pipeline."
-    ),
-    llm=academic_llm,
-    tools=[SerperDevTool()],
-    verbose=True,
-    allow_delegation=False  # Maintains clear chain of command
-)
+    return Agent(
+        role="Lead Research Methodologist",
+        goal="Execute high-fidelity data acquisition and cross-verify empirical evidence across global repositories.",
+        backstory=(
+            "You are a Distinguished Research Fellow with a specialization in systemic information retrieval. "
+            "Your expertise lies in discerning high-impact academic journals, trade publications, and authoritative "
+            "digital archives. You prioritize methodological transparency and source credibility above all, "
+            "ensuring that only the most robust data enters the research pipeline."
+        ),
+        llm=get_academic_llm(),
+        # Repeated queries are served from the shared search cache
+        tools=[CachedSerperDevTool(published_after=published_after, exclude_links=frozenset(exclude_links))],
+        verbose=True,
+        allow_delegation=False  # Maintains clear chain of command
+    )
@@ -4,18 +4,51 @@ from dotenv import load_dotenv
 # Load environment variables explicitly before importing agents
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Annotated, Dict, Optional, List, Tuple
 import os
+import uuid
+import socket
 import asyncio
+from concurrent.futures import Future
 from datetime import datetime
-from crew import research_crew
+from crew import OUTPUT_ROOT, TASK_OUTPUT_FILES, crew_config, get_output_dir, warm_state, warm_up
+from orchestration.artifact_catalog import get_artifact_catalog
+from orchestration.dedupe import make_dedupe_key, reuse_cutoff
+from orchestration.events import EventBus
+from orchestration.file_transfer import build_file_response
+from orchestration.checkpoints import RunCheckpoint
+from orchestration.job_queue import RESUMABLE_STATUSES, TERMINAL_STATUSES, Job, create_job_queue
+from orchestration.llm_cache import LLM_CACHE_MODE, get_llm_cache
+from orchestration.manuscript_stream import STREAM_POLL_SECONDS, is_record_boundary, read_stream
+from orchestration.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, WEBSOCKETS_OPEN, render_metrics
+from orchestration.run_control import RunStopped, cancel_local_run
+from orchestration.run_trace import load_trace
+from orchestration.runner import LeaseLost, run_research_job
+from orchestration.search_cache import get_search_cache
+from orchestration.session_store import create_session_store
+from orchestration.worker_pool import MAX_QUEUED_RESEARCH, ResearchWorkerPool
 import json
 
+# --- Execution Configuration ---
+# "inline": this API process also runs queued jobs on its worker pool
+# "queue": jobs are only enqueued and executed by separate `python worker.py` processes
+RESEARCH_EXECUTION_MODE = os.getenv("RESEARCH_EXECUTION_MODE", "inline")
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 5))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", 15))
+# How often jobs run by other processes are re-read for their subscribers; only subscribed IDs are read
+JOB_WATCH_SECONDS = float(os.getenv("JOB_WATCH_SECONDS", 1))
+# "background": load the crew engine right after startup without delaying it | "lazy": load on the first job
+CREW_WARMUP = os.getenv("CREW_WARMUP", "background")
+# Single-topic requests from the UI outrank batch jobs by default, so they never wait behind a bulk submission
+INTERACTIVE_PRIORITY = int(os.getenv("INTERACTIVE_PRIORITY", 10))
+MAX_BATCH_TOPICS = int(os.getenv("MAX_BATCH_TOPICS", 200))
+MAX_QUEUED_BATCH_RESEARCH = int(os.getenv("MAX_QUEUED_BATCH_RESEARCH", 1000))
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Multi-Agent Research Assistant API",
@@ -41,6 +74,8 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # --- Pydantic Models ---
 class ResearchRequest(BaseModel):
     topic: str = Field(..., min_length=3, max_length=500, description="Research topic to investigate")
+    force_refresh: bool = Field(False, description="Start a new run even if an identical one is running or recently finished")
+    refresh: bool = Field(False, description="Revise the latest completed report on this topic, searching only for material published since that run")
     
     class Config:
         json_schema_extra = {
@@ -50,18 +85,80 @@ class ResearchRequest(BaseModel):
         }
 
 
+class BatchResearchRequest(BaseModel):
+    topics: List[Annotated[str, Field(min_length=3, max_length=500)]] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_TOPICS, description="Research topics to investigate"
+    )
+    priority: int = Field(0, ge=-100, le=100, description="Higher runs sooner; single-topic requests default to INTERACTIVE_PRIORITY")
+    client_id: Optional[str] = Field(None, max_length=100, description="Fair-share identity; defaults to the X-Client-ID header or client address")
+    force_refresh: bool = Field(False, description="Start new runs even for topics identical to running or recent ones")
+    refresh: bool = Field(False, description="Revise each topic's latest completed report instead of researching it from scratch")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "topics": ["Quantum Computing Applications in Drug Discovery", "Edge AI for Predictive Maintenance"],
+                "priority": 0,
+                "client_id": "literature-pipeline"
+            }
+        }
+
+
 class ResearchResponse(BaseModel):
     status: str
     message: str
     research_id: Optional[str] = None
+    deduplicated: bool = False
+    refreshed_from: Optional[str] = None
     timestamp: str
 
 
+class BatchJob(BaseModel):
+    research_id: str
+    topic: str
+    status: str
+    progress: int = 0
+    deduplicated: bool = False
+
+
+class BatchStatus(BaseModel):
+    batch_id: str
+    client_id: Optional[str] = None
+    status: str
+    progress: int
+    total: int
+    counts: Dict[str, int]
+    created_at: str
+    jobs: List[BatchJob]
+
+
+class ContextCompaction(BaseModel):
+    budget_tokens: int
+    tokens_in: int
+    tokens_out: int
+    compaction_ratio: float
+    duplicates_dropped: int = 0
+    chunks_summarized: int = 0
+    references: int = 0
+
+
+class StageProgress(BaseModel):
+    status: str
+    agent: str
+    llm_turns: int = 0
+    tool_calls: int = 0
+    elapsed_seconds: float = 0.0
+    context: Optional[ContextCompaction] = None
+
+
 class ResearchStatus(BaseModel):
     research_id: str
     status: str
     progress: int
     current_agent: Optional[str] = None
+    current_task: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    stages: Dict[str, StageProgress] = {}
     message: str
 
 
@@ -72,7 +169,113 @@ class FileDownloadResponse(BaseModel):
 
 
 # --- Global State Management ---
-active_research_sessions = {}
+session_store = create_session_store()
+job_queue = create_job_queue()
+worker_pool = ResearchWorkerPool()
+event_bus = EventBus()
+dispatch_event = asyncio.Event()
+
+
+@app.on_event("startup")
+async def start_dispatcher():
+    event_bus.bind(asyncio.get_running_loop())
+    asyncio.create_task(watch_subscribed_jobs())
+    if RESEARCH_EXECUTION_MODE == "inline":
+        asyncio.create_task(dispatch_jobs())
+        if CREW_WARMUP == "background":
+            asyncio.create_task(warm_engine())
+    asyncio.create_task(backfill_artifact_catalog())
+
+
+async def warm_engine():
+    """Import crewai and build the agent LLM clients off the event loop once the server is accepting requests"""
+    try:
+        state = await asyncio.to_thread(warm_up)
+        print(f"Crew engine warmed in {state['seconds']}s")
+    except Exception as e:
+        print(f"Crew engine warm-up failed: {e}")
+
+
+def engine_ready() -> bool:
+    # In queue mode this process never runs a crew, so it is ready as soon as it serves requests
+    return RESEARCH_EXECUTION_MODE != "inline" or warm_state()["status"] == "ready"
+
+
+@app.on_event("shutdown")
+async def shutdown_worker_pool():
+    worker_pool.shutdown(wait=False)
+    job_queue.close()
+    session_store.close()
+
+
+def session_event(session: dict) -> dict:
+    """Snapshot of a session as pushed to WebSocket and SSE subscribers"""
+    event = {
+        "research_id": session["research_id"],
+        "status": session["status"],
+        "progress": session.get("progress", 0),
+        "current_agent": session.get("current_agent") or "",
+        "current_task": session.get("current_task"),
+        "elapsed_seconds": session.get("elapsed_seconds", 0.0),
+        "stages": session.get("stages") or {},
+        "timestamp": datetime.now().isoformat()
+    }
+    if session.get("error"):
+        event["error"] = session["error"]
+    return event
+
+
+def is_same_event(event: dict, previous: Optional[dict]) -> bool:
+    """True when an event carries no change over the one last sent to a subscriber"""
+    return previous is not None and all(
+        event.get(key) == previous.get(key) for key in ("status", "progress", "current_agent", "current_task", "stages", "error")
+    )
+
+
+def update_session(research_id: str, **fields) -> Optional[dict]:
+    """
+    Apply a status transition to a stored session and push it to subscribers
+    Safe to call from worker pool threads
+    """
+    session = session_store.update(research_id, **fields)
+    if session is not None:
+        event_bus.publish(research_id, session_event(session))
+    return session
+
+
+def load_session(research_id: str) -> Optional[dict]:
+    """
+    Return the session for a research ID, refreshed from the job queue while it is still in flight
+    Sessions evicted from the store, submitted before a restart or run by external workers are rebuilt from the queue
+    """
+    session = session_store.get(research_id)
+    if session is not None and session["status"] in TERMINAL_STATUSES:
+        return session
+    
+    job = job_queue.get(research_id)
+    if job is None:
+        return session
+    
+    fields = {
+        "status": job.status,
+        "progress": job.progress,
+        "current_agent": job.current_agent,
+        "current_task": job.current_task,
+        "elapsed_seconds": job.elapsed_seconds,
+        "stages": job.stages
+    }
+    if job.status == "completed":
+        fields.update(result_path=job.result_path, completed_at=job.finished_at)
+    elif job.status in TERMINAL_STATUSES:
+        fields.update(error=job.error, failed_at=job.finished_at)
+    
+    if session is None:
+        session = {"research_id": research_id, "topic": job.topic, "started_at": job.created_at, **fields}
+        session_store.put(research_id, session)
+        event_bus.publish(research_id, session_event(session))
+    elif any(session.get(key) != value for key, value in fields.items()):
+        session = update_session(research_id, **fields) or {**session, **fields}
+    return session
 
 
 # --- API Endpoints ---
@@ -103,72 +306,339 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "api_keys_configured": len(missing_keys) == 0,
         "missing_keys": missing_keys,
+        "execution_mode": RESEARCH_EXECUTION_MODE,
+        "engine": {"ready": engine_ready(), **warm_state()},
+        "workers": worker_pool.stats(),
+        "jobs": job_queue.stats(),
+        "subscribers": event_bus.subscriber_count(),
+        "search_cache": get_search_cache().stats(),
+        "llm_cache": {"mode": LLM_CACHE_MODE, **get_llm_cache().stats()} if LLM_CACHE_MODE != "off" else {"mode": "off"},
         "version": "1.0.0"
     }
 
 
-@app.post("/api/research/start", response_model=ResearchResponse)
-async def start_research(request: ResearchRequest):
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint; queue gauges are sampled from the shared job queue on every scrape"""
+    jobs = await asyncio.to_thread(job_queue.stats)
+    return Response(render_metrics(jobs, worker_pool.stats()), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 503 until this process can start a crew without paying the engine load time"""
+    state = {"ready": engine_ready(), "execution_mode": RESEARCH_EXECUTION_MODE, **warm_state()}
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
+def client_identity(request: Request, client_id: Optional[str] = None) -> str:
+    """Fair-share key: an explicit client ID, else the X-Client-ID header, else the caller's address"""
+    return client_id or request.headers.get("x-client-id") or (request.client.host if request.client else "unknown")
+
+
+def is_reusable(job: Job) -> bool:
+    """A duplicate can be attached to while in flight, and handed back once completed while its result is on disk"""
+    return job.status != "completed" or os.path.exists(job.result_path or "")
+
+
+def find_reusable(topic: str, force_refresh: bool = False) -> tuple:
     """
-    Initiate a new research task
-    Returns a research_id for tracking progress
+    Identical topic and crew configuration: the queued, running or recently completed job to attach to
+    Returns (dedupe_key, job or None); force_refresh never reuses
     """
-    # Validate API keys
+    dedupe_key = make_dedupe_key(topic, crew_config())
+    if force_refresh:
+        return dedupe_key, None
+    duplicate = job_queue.find_duplicate(dedupe_key, completed_since=reuse_cutoff())
+    if duplicate is not None and is_reusable(duplicate):
+        load_session(duplicate.research_id)
+        return dedupe_key, duplicate
+    return dedupe_key, None
+
+
+def find_refresh_base(dedupe_key: str) -> Optional[str]:
+    """Latest completed run of the same research whose findings and report are still on disk"""
+    base = job_queue.latest_completed(dedupe_key)
+    if base is None:
+        return None
+    run_dir = get_output_dir(base.research_id)
+    required = (TASK_OUTPUT_FILES["research_task"], TASK_OUTPUT_FILES["writing_task"])
+    if not all(os.path.exists(os.path.join(run_dir, filename)) for filename in required):
+        return None
+    return base.research_id
+
+
+def enqueue_topic(
+    topic: str,
+    dedupe_key: str,
+    client_id: str,
+    priority: int,
+    batch_id: Optional[str] = None,
+    refresh_from: Optional[str] = None,
+    reuse: bool = True
+) -> Tuple[Job, bool]:
+    """
+    Queue a job for the topic, or return the duplicate a concurrent identical submission queued first
+    Returns (job, created); `reuse=False` (force_refresh) always queues a new job
+    """
+    # Generate unique research ID (suffix keeps IDs distinct for submissions within the same second)
+    research_id = f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    payload = {"refresh_from": refresh_from} if refresh_from else None
+    
+    # Persist the job first so it survives a restart, then track it in the session store
+    if reuse:
+        job, created = job_queue.enqueue_unique(
+            research_id, topic, dedupe_key, completed_since=reuse_cutoff(), reusable=is_reusable,
+            payload=payload, priority=priority, client_id=client_id, batch_id=batch_id
+        )
+        if not created:
+            load_session(job.research_id)
+            return job, False
+    else:
+        job = job_queue.enqueue(
+            research_id, topic, payload=payload,
+            dedupe_key=dedupe_key, priority=priority, client_id=client_id, batch_id=batch_id
+        )
+    session_store.put(research_id, {
+        "topic": topic,
+        "status": "queued",
+        "progress": 0,
+        "started_at": job.created_at
+    })
+    return job, True
+
+
+def require_api_keys() -> None:
     if not os.getenv('SERPER_API_KEY') or not os.getenv('GROQ_API_KEY'):
         raise HTTPException(
             status_code=503,
             detail="API keys not configured. Please set SERPER_API_KEY and GROQ_API_KEY in .env file"
         )
+
+
+def reused_response(duplicate: Job) -> ResearchResponse:
+    if duplicate.status == "completed":
+        message = f"Reusing research completed at {duplicate.finished_at}"
+    else:
+        message = "Identical research already in progress; attached to it"
+    return ResearchResponse(
+        status="success",
+        message=message,
+        research_id=duplicate.research_id,
+        deduplicated=True,
+        timestamp=datetime.now().isoformat()
+    )
+
+
+@app.post("/api/research/start", response_model=ResearchResponse)
+async def start_research(request: ResearchRequest, http_request: Request):
+    """
+    Initiate a new research task
+    Returns a research_id for tracking progress
+    """
+    require_api_keys()
     
-    # Generate unique research ID
-    research_id = f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # Identical topic and crew configuration: attach to the running job or hand back a fresh result
+    dedupe_key, duplicate = await asyncio.to_thread(find_reusable, request.topic, request.force_refresh)
+    if duplicate is not None:
+        return reused_response(duplicate)
     
-    # Store in active sessions
-    active_research_sessions[research_id] = {
-        "topic": request.topic,
-        "status": "queued",
-        "progress": 0,
-        "started_at": datetime.now().isoformat()
-    }
+    # Reject new work once the durable backlog is full (batch jobs have their own limit)
+    if await asyncio.to_thread(job_queue.queue_depth, False) >= MAX_QUEUED_RESEARCH:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Research queue is full ({MAX_QUEUED_RESEARCH} jobs waiting). Please retry later."
+        )
     
-    # Start research in background
-    asyncio.create_task(execute_research(research_id, request.topic))
+    # Refresh: revise the latest completed report with newer material instead of starting from scratch
+    refresh_from = await asyncio.to_thread(find_refresh_base, dedupe_key) if request.refresh else None
+    # The lookup above is a fast path; this re-checks and inserts atomically, so racing submissions share one job
+    job, created = await asyncio.to_thread(
+        enqueue_topic, request.topic, dedupe_key, client_identity(http_request), INTERACTIVE_PRIORITY,
+        refresh_from=refresh_from, reuse=not request.force_refresh
+    )
+    if not created:
+        return reused_response(job)
+    
+    # Wake the in-process dispatcher (no-op when external workers consume the queue)
+    dispatch_event.set()
     
+    if refresh_from:
+        message = f"Refreshing the report of {refresh_from} with material published since that run"
+    elif request.refresh:
+        message = "No completed report to refresh; full research initiated"
+    else:
+        message = "Research task initiated successfully"
     return ResearchResponse(
         status="success",
-        message="Research task initiated successfully",
-        research_id=research_id,
+        message=message,
+        research_id=job.research_id,
+        refreshed_from=refresh_from,
         timestamp=datetime.now().isoformat()
     )
 
 
-async def execute_research(research_id: str, topic: str):
+@app.post("/api/research/batch", response_model=BatchStatus)
+async def start_research_batch(request: BatchResearchRequest, http_request: Request):
+    """
+    Submit many topics at once
+    Jobs are scheduled by priority and per-client fair share; poll the returned batch_id for aggregate status
+    """
+    require_api_keys()
+    
+    topics = request.topics
+    if await asyncio.to_thread(job_queue.queue_depth, True) + len(topics) > MAX_QUEUED_BATCH_RESEARCH:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Batch queue is full ({MAX_QUEUED_BATCH_RESEARCH} jobs may wait). Please retry later."
+        )
+    
+    batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    client_id = client_identity(http_request, request.client_id)
+    
+    def submit_all() -> BatchStatus:
+        research_ids = []
+        for topic in topics:
+            dedupe_key, duplicate = find_reusable(topic, request.force_refresh)
+            if duplicate is not None:
+                research_ids.append(duplicate.research_id)
+            else:
+                refresh_from = find_refresh_base(dedupe_key) if request.refresh else None
+                job, _ = enqueue_topic(
+                    topic, dedupe_key, client_id, request.priority, batch_id, refresh_from,
+                    reuse=not request.force_refresh
+                )
+                research_ids.append(job.research_id)
+        job_queue.create_batch(batch_id, research_ids, client_id)
+        return build_batch_status(batch_id)
+    
+    status = await asyncio.to_thread(submit_all)
+    dispatch_event.set()
+    return status
+
+
+def build_batch_status(batch_id: str) -> Optional[BatchStatus]:
+    """Aggregate status of a batch, read from the job queue in one query"""
+    found = job_queue.get_batch(batch_id)
+    if found is None:
+        return None
+    batch, jobs = found
+    counts = {status: 0 for status in ("queued", "running") + TERMINAL_STATUSES}
+    for job in jobs:
+        counts[job.status] = counts.get(job.status, 0) + 1
+    
+    finished = sum(counts[status] for status in TERMINAL_STATUSES)
+    if finished < len(jobs):
+        status = "running" if finished or counts["running"] else "queued"
+    elif counts["completed"] == len(jobs):
+        status = "completed"
+    else:
+        status = "completed_with_errors" if counts["completed"] else "failed"
+    
+    return BatchStatus(
+        batch_id=batch_id,
+        client_id=batch["client_id"],
+        status=status,
+        progress=round(sum(100 if job.status in TERMINAL_STATUSES else job.progress for job in jobs) / max(1, len(jobs))),
+        total=len(jobs),
+        counts=counts,
+        created_at=batch["created_at"],
+        jobs=[
+            BatchJob(
+                research_id=job.research_id,
+                topic=job.topic,
+                status=job.status,
+                progress=job.progress,
+                deduplicated=job.batch_id != batch_id
+            )
+            for job in jobs
+        ]
+    )
+
+
+@app.get("/api/research/batch/{batch_id}", response_model=BatchStatus)
+async def get_batch_status(batch_id: str):
+    """
+    Aggregate status of a batch plus the status of each of its jobs
+    """
+    status = await asyncio.to_thread(build_batch_status, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch ID not found")
+    return status
+
+
+async def dispatch_jobs():
+    """
+    Claim queued jobs into the local worker pool whenever a slot is free
+    Wakes on new submissions and finished runs, and polls for jobs whose lease expired
+    """
+    worker_id = f"api:{socket.gethostname()}:{os.getpid()}"
+    while True:
+        dispatch_event.clear()
+        try:
+            while worker_pool.has_capacity():
+                job = await asyncio.to_thread(job_queue.claim, worker_id)
+                if job is None:
+                    break
+                future = worker_pool.submit(run_research_job, job_queue, job, update_session)
+                asyncio.create_task(execute_research(job.research_id, future))
+        except Exception as e:
+            print(f"Job dispatcher error: {e}")
+        
+        try:
+            await asyncio.wait_for(dispatch_event.wait(), timeout=JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def watch_subscribed_jobs():
     """
-    Execute research task asynchronously
+    Push status changes for jobs executed outside this process
+    A single shared loop refreshes only the research IDs that currently have subscribers
+    """
+    while True:
+        await asyncio.sleep(JOB_WATCH_SECONDS)
+        for research_id in event_bus.subscribed_ids():
+            try:
+                await asyncio.to_thread(load_session, research_id)
+            except Exception as e:
+                print(f"Job watcher error for {research_id}: {e}")
+
+
+async def execute_research(research_id: str, future: Future):
+    """
+    Await a research job submitted to the worker pool
     Updates session state as it progresses
     """
+    await asyncio.to_thread(load_session, research_id)
     try:
-        # Update status
-        active_research_sessions[research_id]["status"] = "running"
-        active_research_sessions[research_id]["progress"] = 10
-        active_research_sessions[research_id]["current_agent"] = "Research Specialist"
+        # Wait for the crew to finish without blocking the event loop
+        result_path = await asyncio.wrap_future(future)
         
-        # Run the crew
-        result = await asyncio.to_thread(
-            research_crew.kickoff,
-            {"topic": topic}
+        # Update completion status (the manuscript body stays on disk)
+        await asyncio.to_thread(
+            update_session,
+            research_id,
+            status="completed",
+            progress=100,
+            result_path=result_path,
+            completed_at=datetime.now().isoformat()
         )
         
-        # Update completion status
-        active_research_sessions[research_id]["status"] = "completed"
-        active_research_sessions[research_id]["progress"] = 100
-        active_research_sessions[research_id]["result"] = str(result)
-        active_research_sessions[research_id]["completed_at"] = datetime.now().isoformat()
-        
+    except LeaseLost:
+        # Another claim owns the job now; its state comes from the queue
+        await asyncio.to_thread(load_session, research_id)
     except Exception as e:
-        active_research_sessions[research_id]["status"] = "failed"
-        active_research_sessions[research_id]["error"] = str(e)
-        active_research_sessions[research_id]["failed_at"] = datetime.now().isoformat()
+        await asyncio.to_thread(
+            update_session,
+            research_id,
+            status=e.status if isinstance(e, RunStopped) else "failed",
+            error=str(e),
+            failed_at=datetime.now().isoformat()
+        )
+    finally:
+        # A slot just freed up
+        dispatch_event.set()
 
 
 @app.get("/api/research/status/{research_id}", response_model=ResearchStatus)
@@ -176,60 +646,203 @@ async def get_research_status(research_id: str):
     """
     Get the current status of a research task
     """
-    if research_id not in active_research_sessions:
+    session = await asyncio.to_thread(load_session, research_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Research ID not found")
     
-    session = active_research_sessions[research_id]
-    
     return ResearchStatus(
         research_id=research_id,
         status=session["status"],
         progress=session.get("progress", 0),
         current_agent=session.get("current_agent"),
+        current_task=session.get("current_task"),
+        elapsed_seconds=session.get("elapsed_seconds", 0.0),
+        stages=session.get("stages") or {},
         message=f"Research on '{session['topic']}' is {session['status']}"
     )
 
 
-@app.get("/api/manuscripts")
-async def list_manuscripts():
+@app.delete("/api/research/{research_id}")
+async def cancel_research(research_id: str):
+    """
+    Cancel a research task
+    A queued job never starts; a running crew stops at its next agent step or LLM call and frees its slot
+    """
+    session = await asyncio.to_thread(load_session, research_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Research ID not found")
+    if session["status"] in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Research is already {session['status']}")
+    
+    status = await asyncio.to_thread(job_queue.cancel, research_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Research ID not found")
+    if status == "cancelling":
+        # Runs on this process's pool stop right away; external workers notice on their next queue poll
+        cancel_local_run(research_id)
+    else:
+        await asyncio.to_thread(load_session, research_id)
+    
+    return {
+        "research_id": research_id,
+        "status": status,
+        "message": "Research cancelled" if status == "cancelled" else "Cancellation requested; the run stops at its next step",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.post("/api/research/{research_id}/resume", response_model=ResearchResponse)
+async def resume_research(research_id: str):
     """
-    List all available research manuscripts (markdown files)
+    Queue a failed, cancelled or timed-out run again
+    Tasks whose output was checkpointed are not repeated; the crew restarts at the first incomplete task
     """
-    files = []
-    # Identify system files to exclude
-    system_files = ["README.md", "QUICKSTART.md", "SETUP_COMPLETE.md", "requirements.txt"]
+    session = await asyncio.to_thread(load_session, research_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Research ID not found")
+    if session["status"] not in RESUMABLE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Only failed, cancelled or timed-out research can be resumed (status: {session['status']})")
+    
+    done = await asyncio.to_thread(RunCheckpoint(research_id).completed, list(TASK_OUTPUT_FILES))
+    if not await asyncio.to_thread(job_queue.requeue, research_id):
+        raise HTTPException(status_code=409, detail="Research is no longer resumable")
+    await asyncio.to_thread(
+        update_session, research_id, status="queued", error=None, current_agent=None, current_task=None
+    )
+    dispatch_event.set()
     
+    if done:
+        message = f"Resuming after {', '.join(done)}; completed tasks are reused"
+    else:
+        message = "No task had completed; restarting from the first task"
+    return ResearchResponse(
+        status="success",
+        message=message,
+        research_id=research_id,
+        timestamp=datetime.now().isoformat()
+    )
+
+
+@app.get("/api/research/trace/{research_id}")
+async def get_research_trace(research_id: str):
+    """
+    Timing trace of a finished run: stage totals plus one span per LLM call, tool call and runner step
+    """
     try:
-        # Scan current directory
-        for filename in os.listdir("."):
-            # Filter logic: .md files OR files containing "manuscript"/"report"
-            is_md = filename.lower().endswith(".md")
-            is_relevant_name = "manuscript" in filename.lower() or "report" in filename.lower()
-            
-            if (is_md or is_relevant_name) and filename not in system_files:
-                if not os.path.isfile(filename):
-                     continue
-                     
-                stats = os.stat(filename)
-                files.append({
-                    "filename": filename,
-                    "created_at": datetime.fromtimestamp(stats.st_mtime).isoformat(),
-                    "size_bytes": stats.st_size,
-                    "type": "report" if is_relevant_name else "data"
-                })
-        
-        # Sort by modification time (newest first)
-        files.sort(key=lambda x: x["created_at"], reverse=True)
-        return {"manuscripts": files}
+        get_output_dir(research_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid research ID")
+    trace = await asyncio.to_thread(load_trace, research_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="No trace recorded for this research ID (yet)")
+    return trace
+
+
+async def backfill_artifact_catalog():
+    """
+    Catalog run directories written before the index existed
+    Runs once in the background so startup is never blocked on a large output history
+    """
+    try:
+        count = await asyncio.to_thread(get_artifact_catalog().backfill, OUTPUT_ROOT, TASK_OUTPUT_FILES)
+        if count:
+            print(f"Artifact catalog: indexed {count} existing files from {OUTPUT_ROOT}")
+    except Exception as e:
+        print(f"Artifact catalog backfill failed: {e}")
+
+
+@app.get("/api/manuscripts")
+async def list_manuscripts(
+    research_id: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    List research manuscripts from the artifact catalog, newest first
+    Reads one index page instead of scanning the output tree; filter by research_id to get a single run
+    """
+    try:
+        total, artifacts = await asyncio.to_thread(
+            get_artifact_catalog().list, research_id=research_id, offset=offset, limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    manuscripts = [
+        {
+            "filename": f"{artifact['research_id']}/{artifact['filename']}",
+            "research_id": artifact["research_id"],
+            "topic": artifact["topic"],
+            "task": artifact["task"],
+            "created_at": datetime.fromtimestamp(artifact["created_at"]).isoformat(),
+            "size_bytes": artifact["size_bytes"],
+            "content_hash": artifact["content_hash"],
+            "type": artifact["type"]
+        }
+        for artifact in artifacts
+    ]
+    return {"total": total, "offset": offset, "limit": limit, "manuscripts": manuscripts}
+
+
+def parse_timestamp(value: Optional[str], name: str) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO date or datetime")
+
+
+@app.get("/api/manuscripts/search")
+async def search_manuscripts(
+    q: str = Query(..., min_length=1, max_length=500),
+    research_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Full-text search over findings, analyses and final reports, best match first
+    Served from the catalog's FTS index; `since`/`until` filter on the artifact's creation time
+    """
+    since_ts, until_ts = parse_timestamp(since, "since"), parse_timestamp(until, "until")
+    try:
+        total, hits = await asyncio.to_thread(
+            get_artifact_catalog().search, q, research_id=research_id, since=since_ts, until=until_ts,
+            offset=offset, limit=limit
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    results = [
+        {
+            "filename": f"{hit['research_id']}/{hit['filename']}",
+            "research_id": hit["research_id"],
+            "topic": hit["topic"],
+            "task": hit["task"],
+            "created_at": datetime.fromtimestamp(hit["created_at"]).isoformat(),
+            "score": round(-hit["rank"], 4),
+            "snippet": hit["snippet"]
+        }
+        for hit in hits
+    ]
+    return {"query": q, "total": total, "offset": offset, "limit": limit, "results": results}
+
+
+def read_file_download(path: str, filename: str) -> FileDownloadResponse:
+    """JSON body for the frontend: one read, size taken from the bytes already in memory"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return FileDownloadResponse(filename=filename, content=data.decode('utf-8'), size_bytes=len(data))
+
 
 @app.get("/api/research/results/{filename}")
-async def get_research_file(filename: str):
+async def get_research_file(filename: str, request: Request, raw: bool = False):
     """
     Download research output files
     Now supports dynamic filenames generated by agents
+    Pass raw=true for a streamed, cacheable, range-capable download instead of JSON
     """
     # Security: Prevent directory traversal and system file access
     safe_filename = os.path.basename(filename)
@@ -244,70 +857,232 @@ async def get_research_file(filename: str):
     if ext in blocked_extensions or safe_filename in blocked_files or safe_filename.startswith('.'):
          raise HTTPException(status_code=403, detail="Access denied to this file type")
     
-    if not os.path.exists(safe_filename):
+    if not os.path.isfile(safe_filename):
         raise HTTPException(status_code=404, detail="File not found.")
     
+    if raw:
+        return build_file_response(request.headers, safe_filename, safe_filename)
+    
     try:
-        with open(safe_filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return FileDownloadResponse(
-            filename=safe_filename,
-            content=content,
-            size_bytes=len(content.encode('utf-8'))
-        )
+        return await asyncio.to_thread(read_file_download, safe_filename, safe_filename)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
+
+
+@app.get("/api/research/results/{research_id}/{filename}")
+async def get_run_research_file(research_id: str, filename: str, request: Request, raw: bool = False):
+    """
+    Download an output file produced by a specific research run
+    Pass raw=true for a streamed, cacheable, range-capable download instead of JSON
+    """
+    safe_filename = os.path.basename(filename)
+    if safe_filename != filename or safe_filename.startswith('.'):
+        raise HTTPException(status_code=400, detail="Invalid filename security check")
+    
+    try:
+        run_dir = get_output_dir(research_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid research ID")
+    
+    path = os.path.join(run_dir, safe_filename)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="File not found.")
+    
+    if raw:
+        # The catalogued SHA-256 makes a strong ETag as long as the file has not changed since indexing
+        artifact = await asyncio.to_thread(get_artifact_catalog().get, research_id, safe_filename)
+        stats = os.stat(path)
+        content_hash = None
+        if artifact and artifact["size_bytes"] == stats.st_size and artifact["created_at"] == stats.st_mtime:
+            content_hash = artifact["content_hash"]
+        return build_file_response(request.headers, path, safe_filename, content_hash)
+    
+    try:
+        return await asyncio.to_thread(read_file_download, path, safe_filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
 
 
 @app.get("/api/research/list")
-async def list_research_sessions():
+async def list_research_sessions(
+    status: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500)
+):
     """
-    List all research sessions
+    List research sessions, newest first
+    Supports paging and filtering by status
     """
+    def read_page() -> tuple:
+        total, sessions = session_store.list(status=status, offset=offset, limit=limit)
+        # Only in-flight sessions on this page need a refresh from the queue
+        return total, [
+            session if session["status"] in TERMINAL_STATUSES else load_session(session["research_id"]) or session
+            for session in sessions
+        ]
+    
+    total, sessions = await asyncio.to_thread(read_page)
     return {
-        "total_sessions": len(active_research_sessions),
+        "total_sessions": total,
+        "offset": offset,
+        "limit": limit,
         "sessions": [
             {
-                "research_id": rid,
+                "research_id": session["research_id"],
                 "topic": session["topic"],
                 "status": session["status"],
                 "started_at": session["started_at"]
             }
-            for rid, session in active_research_sessions.items()
+            for session in sessions
         ]
     }
 
 
-# --- WebSocket for Real-time Updates ---
+# --- Real-time Updates (WebSocket & Server-Sent Events) ---
 @app.websocket("/ws/research/{research_id}")
 async def websocket_research_updates(websocket: WebSocket, research_id: str):
     """
     WebSocket endpoint for real-time research progress updates
+    Sends the current state on connect, then pushes each status change as it happens
     """
     await websocket.accept()
     
-    try:
-        while True:
-            if research_id in active_research_sessions:
-                session = active_research_sessions[research_id]
-                await websocket.send_json({
-                    "research_id": research_id,
-                    "status": session["status"],
-                    "progress": session.get("progress", 0),
-                    "current_agent": session.get("current_agent", ""),
-                    "timestamp": datetime.now().isoformat()
-                })
+    # Subscribe before reading the snapshot so no transition can slip in between
+    async with event_bus.subscribe(research_id) as subscription:
+        session = await asyncio.to_thread(load_session, research_id)
+        if session is None:
+            await websocket.send_json({"research_id": research_id, "error": "Research ID not found"})
+            await websocket.close(code=4404)
+            return
+        
+        receive_task = asyncio.create_task(websocket.receive())
+        event_task = None
+        last_sent = None
+        WEBSOCKETS_OPEN.inc()
+        try:
+            event = session_event(session)
+            while True:
+                if not is_same_event(event, last_sent):
+                    await websocket.send_json(event)
+                    last_sent = event
+                    
+                    # If completed or failed, close connection
+                    if event["status"] in TERMINAL_STATUSES:
+                        await websocket.close()
+                        break
                 
-                # If completed or failed, close connection
-                if session["status"] in ["completed", "failed"]:
-                    await websocket.close()
-                    break
-            
-            await asyncio.sleep(2)  # Update every 2 seconds
+                # Sleep until the next event; client messages are ignored but a disconnect ends the loop
+                event_task = asyncio.create_task(subscription.get())
+                while not event_task.done():
+                    done, _ = await asyncio.wait({event_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if receive_task in done:
+                        if receive_task.result()["type"] == "websocket.disconnect":
+                            raise WebSocketDisconnect()
+                        receive_task = asyncio.create_task(websocket.receive())
+                event = event_task.result()
+        
+        except WebSocketDisconnect:
+            print(f"WebSocket disconnected for research_id: {research_id}")
+        finally:
+            WEBSOCKETS_OPEN.dec()
+            receive_task.cancel()
+            if event_task is not None:
+                event_task.cancel()
+
+
+@app.get("/api/research/events/{research_id}")
+async def stream_research_events(research_id: str, request: Request):
+    """
+    Server-Sent Events feed with the same payloads as the WebSocket endpoint
+    """
+    if await asyncio.to_thread(load_session, research_id) is None:
+        raise HTTPException(status_code=404, detail="Research ID not found")
+    
+    async def event_stream():
+        async with event_bus.subscribe(research_id) as subscription:
+            session = await asyncio.to_thread(load_session, research_id)
+            if session is None:
+                # Evicted or expired since the check above
+                yield f"event: error\ndata: {json.dumps({'research_id': research_id, 'error': 'Research ID not found'})}\n\n"
+                return
+            event = session_event(session)
+            last_sent = None
+            while True:
+                if not is_same_event(event, last_sent):
+                    yield f"event: status\ndata: {json.dumps(event)}\n\n"
+                    last_sent = event
+                    if event["status"] in TERMINAL_STATUSES:
+                        break
+                
+                # Wake only for real events; the timeout just keeps idle proxies from dropping the stream
+                while True:
+                    try:
+                        event = await asyncio.wait_for(subscription.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected():
+                            return
+                        yield ": keepalive\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/research/stream/{research_id}")
+async def stream_manuscript(research_id: str, request: Request, offset: int = Query(0, ge=0)):
+    """
+    Live agent output (LLM tokens) as Server-Sent Events
+    Every event id is the byte offset to resume from; EventSource sends it back as Last-Event-ID on reconnect
+    """
+    if await asyncio.to_thread(load_session, research_id) is None:
+        raise HTTPException(status_code=404, detail="Research ID not found")
+    
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        offset = int(last_event_id)
+    # Offsets are only meaningful at record boundaries; anything else would resume mid-record
+    if not await asyncio.to_thread(is_record_boundary, research_id, offset):
+        raise HTTPException(status_code=400, detail=f"Offset {offset} is not a record boundary of this run's stream")
+    
+    async def chunk_stream():
+        position = offset
+        idle_seconds = 0.0
+        yield "retry: 2000\n\n"
+        while True:
+            # Each batch is bounded and only read after the previous one was accepted by the client,
+            # so a slow reader falls behind in the log instead of growing server memory
+            records, next_position = await asyncio.to_thread(read_stream, research_id, position)
+            if records:
+                position = next_position
+                idle_seconds = 0.0
+                yield f"id: {position}\nevent: chunks\ndata: {json.dumps(records)}\n\n"
+                if records[-1]["type"] == "end":
+                    return
+                continue
             
-    except WebSocketDisconnect:
-        print(f"WebSocket disconnected for research_id: {research_id}")
+            await asyncio.sleep(STREAM_POLL_SECONDS)
+            idle_seconds += STREAM_POLL_SECONDS
+            if idle_seconds >= SSE_KEEPALIVE_SECONDS:
+                idle_seconds = 0.0
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                # Runs that finished without a log (reused or pre-streaming results) never get an end record
+                session = await asyncio.to_thread(load_session, research_id)
+                if session is None or session["status"] in TERMINAL_STATUSES:
+                    records, next_position = await asyncio.to_thread(read_stream, research_id, position)
+                    if not records:
+                        yield f"id: {position}\nevent: chunks\ndata: {json.dumps([{'type': 'end', 'status': session and session['status']}])}\n\n"
+                        return
+    
+    return StreamingResponse(
+        chunk_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 if __name__ == "__main__":
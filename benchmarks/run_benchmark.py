@@ -0,0 +1,263 @@
+"""
+Module: Offline Throughput Benchmark
+Focus: Jobs/sec, Latency Percentiles, Per-Stage Time and Peak RSS Without Network Access
+
+Usage:
+    python -m benchmarks.run_benchmark --jobs 20 --concurrency 5 --workers 2 --llm-latency 0.2
+
+The real API, job queue, worker pool and CrewAI pipeline run unchanged; only the agent
+LLMs and the Serper HTTP call are replaced by stubs with configurable latency and output size.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the research API")
+    parser.add_argument("--jobs", type=int, default=10, help="Research runs to submit")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client-side in-flight submissions")
+    parser.add_argument("--workers", type=int, default=2, help="MAX_CONCURRENT_RESEARCH for the server")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per stub LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Seconds per stub search request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative latency jitter, e.g. 0.2 for +/-20%%")
+    parser.add_argument("--output-chars", type=int, default=2000, help="Characters per stub final answer")
+    parser.add_argument("--searches-per-task", type=int, default=2, help="Search tool calls per research task")
+    parser.add_argument("--distinct-topics", type=int, default=0, help="Cycle through N topics (0 = every job unique)")
+    parser.add_argument("--fanout", type=int, default=1, help="RESEARCH_FANOUT_WIDTH: parallel research streams per run")
+    parser.add_argument("--search-cache", action="store_true", help="Keep the search cache enabled")
+    parser.add_argument("--timeout", type=float, default=600, help="Per-job timeout in seconds")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    parser.add_argument("--keep-outputs", action="store_true", help="Keep generated manuscripts and databases")
+    return parser.parse_args()
+
+
+def configure_environment(args: argparse.Namespace, scratch: str, output_dir: str) -> None:
+    """Must run before the app is imported: every module reads its configuration at import time"""
+    os.environ.update(
+        SERPER_API_KEY="benchmark",
+        GROQ_API_KEY="benchmark",
+        RESEARCH_EXECUTION_MODE="inline",
+        MAX_CONCURRENT_RESEARCH=str(args.workers),
+        MAX_QUEUED_RESEARCH=str(max(args.jobs, 1)),
+        JOB_QUEUE_PATH=os.path.join(scratch, "jobs.db"),
+        SESSION_STORE_PATH=os.path.join(scratch, "sessions.db"),
+        RESULT_DIR=os.path.join(scratch, "results"),
+        SEARCH_CACHE_PATH=os.path.join(scratch, "search_cache.db"),
+        LLM_CACHE_PATH=os.path.join(scratch, "llm_cache.db"),
+        ARTIFACT_CATALOG_PATH=os.path.join(scratch, "artifacts.db"),
+        MANUSCRIPT_STREAM_DIR=os.path.join(scratch, "streams"),
+        RUN_TRACE_DIR=os.path.join(scratch, "traces"),
+        RATE_LIMIT_PATH=os.path.join(scratch, "rate_limits.db"),
+        CHECKPOINT_DIR=os.path.join(scratch, "checkpoints"),
+        LLM_CACHE_MODE="off",
+        RESEARCH_OUTPUT_DIR=output_dir,
+        CREW_VERBOSE="false",
+        RESEARCH_FANOUT_WIDTH=str(args.fanout),
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+    if not args.search_cache:
+        os.environ["SEARCH_CACHE_TTL_SECONDS"] = "0"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def run_job(client, base_url: str, topic: str, timeout: float) -> Dict:
+    started = time.perf_counter()
+    response = await client.post(f"{base_url}/api/research/start", json={"topic": topic})
+    if response.status_code != 200:
+        return {"status": f"http_{response.status_code}", "latency": time.perf_counter() - started, "stages": {}}
+    research_id = response.json()["research_id"]
+
+    last: Dict = {}
+    async with client.stream("GET", f"{base_url}/api/research/events/{research_id}", timeout=timeout) as stream:
+        async for line in stream.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            last = json.loads(line[5:])
+            if last.get("status") in ("completed", "failed"):
+                break
+    return {
+        "research_id": research_id,
+        "status": last.get("status", "unknown"),
+        "latency": time.perf_counter() - started,
+        "stages": last.get("stages") or {},
+        "error": last.get("error"),
+    }
+
+
+async def drive(args: argparse.Namespace, base_url: str) -> Dict:
+    import httpx
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency * 2 + 2)
+
+    def topic_for(index: int) -> str:
+        slot = index % args.distinct_topics if args.distinct_topics else index
+        return f"Benchmark topic {slot}: effects of synthetic workloads on orchestration latency"
+
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        async def bounded(index: int) -> Dict:
+            async with semaphore:
+                try:
+                    return await run_job(client, base_url, topic_for(index), args.timeout)
+                except Exception as e:
+                    return {"status": "client_error", "latency": 0.0, "stages": {}, "error": str(e)}
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(bounded(i) for i in range(args.jobs)))
+        wall = time.perf_counter() - started
+
+        health = (await client.get(f"{base_url}/api/health")).json()
+    return {"results": results, "wall": wall, "health": health}
+
+
+def summarize(args: argparse.Namespace, run: Dict) -> Dict:
+    results = run["results"]
+    completed = [r for r in results if r["status"] == "completed"]
+    latencies = [r["latency"] for r in completed]
+
+    stage_times: Dict[str, List[float]] = {}
+    stage_tools: Dict[str, List[int]] = {}
+    for result in completed:
+        for key, stage in result["stages"].items():
+            stage_times.setdefault(key, []).append(stage.get("elapsed_seconds", 0.0))
+            stage_tools.setdefault(key, []).append(stage.get("tool_calls", 0))
+
+    errors: Dict[str, int] = {}
+    for result in results:
+        if result["status"] != "completed":
+            label = f"{result['status']}: {(result.get('error') or '')[:80]}"
+            errors[label] = errors.get(label, 0) + 1
+
+    return {
+        "config": {
+            key: getattr(args, key)
+            for key in (
+                "jobs", "concurrency", "workers", "llm_latency", "search_latency", "jitter",
+                "output_chars", "searches_per_task", "distinct_topics", "fanout", "search_cache",
+            )
+        },
+        "completed": len(completed),
+        "failed": len(results) - len(completed),
+        "errors": errors,
+        "wall_seconds": round(run["wall"], 3),
+        "jobs_per_second": round(len(completed) / run["wall"], 3) if run["wall"] else 0.0,
+        "latency_seconds": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(max(latencies), 3) if latencies else 0.0,
+        },
+        "stages": {
+            key: {
+                "mean_seconds": round(sum(times) / len(times), 3),
+                "p95_seconds": round(percentile(times, 95), 3),
+                "mean_tool_calls": round(sum(stage_tools[key]) / len(stage_tools[key]), 2),
+            }
+            for key, times in stage_times.items()
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "search_cache": run["health"].get("search_cache"),
+    }
+
+
+def print_report(report: Dict) -> None:
+    latency = report["latency_seconds"]
+    print("\n=== Research API Benchmark ===")
+    print("config: " + ", ".join(f"{k}={v}" for k, v in report["config"].items()))
+    print(f"completed: {report['completed']}  failed: {report['failed']}  wall: {report['wall_seconds']}s")
+    print(f"throughput: {report['jobs_per_second']} jobs/sec")
+    print(
+        f"latency: mean {latency['mean']}s  p50 {latency['p50']}s  p95 {latency['p95']}s  "
+        f"p99 {latency['p99']}s  max {latency['max']}s"
+    )
+    for key, stage in report["stages"].items():
+        print(
+            f"  {key:<14} mean {stage['mean_seconds']}s  p95 {stage['p95_seconds']}s  "
+            f"tool calls {stage['mean_tool_calls']}"
+        )
+    print(f"peak RSS: {report['peak_rss_mb']} MB")
+    for label, count in report["errors"].items():
+        print(f"  error x{count}: {label}")
+
+
+def main() -> int:
+    args = parse_args()
+    scratch = tempfile.mkdtemp(prefix="research_benchmark_")
+    # CrewAI only writes task output files to relative paths
+    output_dir = os.path.join("outputs", f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    configure_environment(args, scratch, output_dir)
+
+    import uvicorn
+
+    from benchmarks.stubs import install_stubs
+
+    install_stubs(
+        llm_latency=args.llm_latency,
+        search_latency=args.search_latency,
+        jitter=args.jitter,
+        output_chars=args.output_chars,
+        searches_per_task=args.searches_per_task,
+    )
+    from app import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        run = asyncio.run(drive(args, f"http://127.0.0.1:{port}"))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        if not args.keep_outputs:
+            shutil.rmtree(scratch, ignore_errors=True)
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    report = summarize(args, run)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Module: API Startup Benchmark
+Focus: Cold Import Time, Time to First Response and Time Until the Crew Engine Is Warm
+
+Usage:
+    python -m benchmarks.startup_benchmark --runs 5
+
+Each run uses a fresh interpreter, so numbers reflect a container cold start rather than a warm reload.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+IMPORT_PROBE = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure API cold-start latency")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes per measurement")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the server to become ready")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def benchmark_env(scratch: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        SERPER_API_KEY="benchmark",
+        GROQ_API_KEY="benchmark",
+        JOB_QUEUE_PATH=os.path.join(scratch, "jobs.db"),
+        SESSION_STORE_PATH=os.path.join(scratch, "sessions.db"),
+        RESULT_DIR=os.path.join(scratch, "results"),
+        SEARCH_CACHE_PATH=os.path.join(scratch, "search_cache.db"),
+        LLM_CACHE_PATH=os.path.join(scratch, "llm_cache.db"),
+        ARTIFACT_CATALOG_PATH=os.path.join(scratch, "artifacts.db"),
+        MANUSCRIPT_STREAM_DIR=os.path.join(scratch, "streams"),
+        RUN_TRACE_DIR=os.path.join(scratch, "traces"),
+        RATE_LIMIT_PATH=os.path.join(scratch, "rate_limits.db"),
+        CHECKPOINT_DIR=os.path.join(scratch, "checkpoints"),
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+    return env
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_import(env: Dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def wait_for(client, url: str, deadline: float, status: int = 200) -> Optional[float]:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == status:
+                return time.perf_counter()
+        except Exception:
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def time_server(env: Dict[str, str], timeout: float) -> Dict[str, Optional[float]]:
+    import httpx
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        with httpx.Client(timeout=5) as client:
+            health = wait_for(client, f"{base_url}/api/health", deadline)
+            frontend = wait_for(client, f"{base_url}/", deadline)
+            ready = wait_for(client, f"{base_url}/api/ready", deadline)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    def since_start(moment: Optional[float]) -> Optional[float]:
+        return round(moment - started, 3) if moment is not None else None
+
+    return {"first_health": since_start(health), "first_frontend": since_start(frontend), "engine_ready": since_start(ready)}
+
+
+def summarize(values: List[Optional[float]]) -> Dict[str, Optional[float]]:
+    measured = [value for value in values if value is not None]
+    if not measured:
+        return {"min": None, "median": None, "max": None}
+    return {
+        "min": round(min(measured), 3),
+        "median": round(statistics.median(measured), 3),
+        "max": round(max(measured), 3),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    scratch = tempfile.mkdtemp(prefix="startup_benchmark_")
+    env = benchmark_env(scratch)
+    try:
+        imports = [time_import(env) for _ in range(args.runs)]
+        servers = [time_server(env, args.timeout) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "runs": args.runs,
+        "import_app_seconds": summarize(imports),
+        "first_health_seconds": summarize([run["first_health"] for run in servers]),
+        "first_frontend_seconds": summarize([run["first_frontend"] for run in servers]),
+        "engine_ready_seconds": summarize([run["engine_ready"] for run in servers]),
+    }
+
+    print("\n=== API Startup Benchmark ===")
+    for name, stats in report.items():
+        if isinstance(stats, dict):
+            print(f"{name:<24} min {stats['min']}s  median {stats['median']}s  max {stats['max']}s")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
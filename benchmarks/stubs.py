@@ -0,0 +1,162 @@
+"""
+Module: Offline Benchmark Stubs
+Focus: Deterministic Stand-ins for the Agent LLMs and the Serper Search API
+"""
+
+import hashlib
+import random
+import time
+from typing import Any
+
+from crewai.events.types.llm_events import LLMCallType
+from crewai.llms.base_llm import BaseLLM, llm_call_context
+
+from orchestration.cache_adapters import CachedSerperDevTool
+
+STREAM_CHUNK_CHARS = 16
+
+# CrewAI lists tools to the model under a sanitized snake_case name
+SEARCH_TOOL_NAME = "search_the_internet_with_serper"
+
+FILLER = (
+    "Empirical evidence across the surveyed literature indicates consistent effects, "
+    "with methodological caveats noted in the source provenance section. "
+)
+
+
+def _jittered(latency: float, jitter: float) -> float:
+    return max(0.0, latency + random.uniform(-jitter, jitter) * latency)
+
+
+def _text_of(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(message.get("content", "")) for message in messages)
+
+
+class StubLLM(BaseLLM):
+    """
+    Offline LLM that speaks CrewAI's ReAct text protocol
+    Agents with the search tool issue `searches_per_task` searches before answering;
+    every final answer is `output_chars` characters long
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    output_chars: int = 2000
+    searches_per_task: int = 2
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        # Report the call on the event bus like a real provider, so metrics and run traces see it
+        with llm_call_context():
+            self._emit_call_started_event(messages, from_task=from_task, from_agent=from_agent)
+            answer = self._answer(messages, from_task, from_agent)
+            usage = {"prompt_tokens": len(_text_of(messages)) // 4, "completion_tokens": len(answer) // 4}
+            self._emit_call_completed_event(
+                answer, LLMCallType.LLM_CALL, from_task=from_task, from_agent=from_agent, usage=usage
+            )
+        return answer
+
+    def _answer(self, messages, from_task, from_agent) -> str:
+        time.sleep(_jittered(self.latency, self.jitter))
+
+        text = _text_of(messages)
+        searches_done = 0 if isinstance(messages, str) else sum(
+            str(message.get("content", "")).count(f"Action: {SEARCH_TOOL_NAME}")
+            for message in messages
+            if message.get("role") == "assistant"
+        )
+        if f"Tool Name: {SEARCH_TOOL_NAME}" in text and searches_done < self.searches_per_task:
+            # Seed queries from the prompt so different topics never share search cache entries
+            seed = hashlib.sha1(text[:2000].encode("utf-8")).hexdigest()[:8]
+            return (
+                "Thought: I need more evidence before answering\n"
+                f"Action: {SEARCH_TOOL_NAME}\n"
+                f'Action Input: {{"search_query": "benchmark {seed} query {searches_done + 1}"}}'
+            )
+
+        body = (FILLER * (self.output_chars // len(FILLER) + 1))[: self.output_chars]
+        answer = f"Thought: I now know the final answer\nFinal Answer: {body}"
+        if self.stream:
+            # Emit the answer in word-sized pieces the way a streaming provider would
+            for start in range(0, len(answer), STREAM_CHUNK_CHARS):
+                self._emit_stream_chunk_event(
+                    answer[start:start + STREAM_CHUNK_CHARS],
+                    from_task=from_task,
+                    from_agent=from_agent,
+                    call_type=LLMCallType.LLM_CALL,
+                )
+        return answer
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+class StubSearchTool(CachedSerperDevTool):
+    """Search tool that fabricates Serper-shaped results after a configurable delay"""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        time.sleep(_jittered(self.latency, self.jitter))
+        return {
+            "organic": [
+                {
+                    "title": f"Result {rank} for {search_query}",
+                    "link": f"https://example.org/{hashlib.sha1(search_query.encode()).hexdigest()[:10]}/{rank}",
+                    "snippet": FILLER,
+                    "position": rank,
+                }
+                for rank in range(1, self.n_results + 1)
+            ]
+        }
+
+
+def install_stubs(
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    jitter: float = 0.0,
+    output_chars: int = 2000,
+    searches_per_task: int = 2,
+) -> None:
+    """
+    Point every agent factory at the stubs
+    Must run before the first crew is built; the rest of the pipeline is left untouched
+    """
+    import agents.content_writer as content_writer
+    import agents.data_analyst as data_analyst
+    import agents.research_specialist as research_specialist
+    import orchestration.cache_adapters as cache_adapters
+
+    def stub_llm(name: str) -> StubLLM:
+        return StubLLM(
+            model=f"stub/{name}",
+            stream=name == "writer" and content_writer.WRITER_STREAM,
+            latency=llm_latency,
+            jitter=jitter,
+            output_chars=output_chars,
+            searches_per_task=searches_per_task,
+        )
+
+    llms = {"research": stub_llm("research"), "analyst": stub_llm("analyst"), "writer": stub_llm("writer")}
+    research_specialist.get_academic_llm = lambda: llms["research"]
+    data_analyst.get_analytical_llm = lambda: llms["analyst"]
+    content_writer.get_publication_llm = lambda: llms["writer"]
+    # Agent factories import the search tool when they run, so replacing the module attribute is enough
+    cache_adapters.CachedSerperDevTool = lambda **kwargs: StubSearchTool(latency=search_latency, jitter=jitter, **kwargs)
@@ -1,23 +1,282 @@
-from crewai import Crew
-
-from agents.research_specialist import research_specialist_agent
-from agents.data_analyst import data_analyst_agent
-from agents.content_writer import content_writer_agent
-from tasks.research_task import research_task
-from tasks.analysis_task import analysis_task
-from tasks.writing_task import writing_task
-
-
-research_crew = Crew(
-    agents=[
-        research_specialist_agent,
-        data_analyst_agent,
-        content_writer_agent,
-    ],
-    tasks=[
-        research_task,
-        analysis_task,
-        writing_task,
-    ],
-    verbose=True
-)
\ No newline at end of file
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from agents import content_writer, data_analyst, research_specialist
+from agents.research_specialist import create_research_specialist_agent
+from agents.data_analyst import create_data_analyst_agent
+from agents.content_writer import create_content_writer_agent
+from tasks.research_task import (
+    RESEARCH_FACETS, RESEARCH_OUTPUT_FILE, create_research_refresh_task, create_research_subtask, create_research_task
+)
+from tasks.analysis_task import ANALYSIS_OUTPUT_FILE, create_analysis_task
+from tasks.writing_task import WRITING_OUTPUT_FILE, create_writing_task
+from orchestration.context_compaction import COMPACTION_SUMMARIZER, ContextCompactor, llm_summarizer
+from orchestration.fanout import RESEARCH_FANOUT_WIDTH, ResearchMerger
+from orchestration.progress import ProgressTracker
+from orchestration.refresh import RefreshBaseline, merge_updates
+
+if TYPE_CHECKING:
+    from crewai import Crew
+    from orchestration.checkpoints import RunCheckpoint
+    from orchestration.manuscript_stream import ManuscriptStream
+    from orchestration.run_control import RunControl
+    from orchestration.run_trace import RunTrace
+
+# --- Output Namespace ---
+# Every run writes its artifacts to <RESEARCH_OUTPUT_DIR>/<research_id>/ instead of the working directory.
+# CrewAI resolves task output files relative to the working directory, so keep this path relative.
+OUTPUT_ROOT = os.getenv("RESEARCH_OUTPUT_DIR", "outputs")
+# Console tracing of every agent thought; turn off for benchmarks and quiet production logs
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "true").lower() == "true"
+
+# File each task writes inside the run directory, used to attribute catalogued artifacts
+TASK_OUTPUT_FILES = {
+    "research_task": RESEARCH_OUTPUT_FILE,
+    "analysis_task": ANALYSIS_OUTPUT_FILE,
+    "writing_task": WRITING_OUTPUT_FILE,
+}
+
+
+def get_output_dir(research_id: str) -> str:
+    if not research_id or os.path.basename(research_id) != research_id or research_id.startswith("."):
+        raise ValueError(f"Invalid research_id: {research_id!r}")
+    return os.path.join(OUTPUT_ROOT, research_id)
+
+
+def crew_config() -> dict:
+    """Model and temperature of every agent: two runs on the same topic only match when these do"""
+    return {
+        "research": [research_specialist.MODEL_NAME, research_specialist.CORE_TEMPERATURE],
+        "analysis": [data_analyst.ANALYST_MODEL, data_analyst.ANALYTICAL_TEMPERATURE],
+        "writing": [content_writer.WRITER_MODEL, content_writer.CREATIVE_TEMPERATURE],
+        "research_fanout": fanout_width(),
+    }
+
+
+def fanout_width() -> int:
+    return max(1, min(RESEARCH_FANOUT_WIDTH, len(RESEARCH_FACETS)))
+
+
+# --- Engine Warm-up ---
+# crewai, litellm and the agent LLM clients take seconds to load, so nothing imports them at module level.
+# warm_up() pays that cost once per process: at API startup in the background, at worker startup,
+# or on the first build_research_crew() call, whichever comes first.
+_warm_lock = threading.Lock()
+_warm_state = {"status": "cold", "seconds": None, "error": None}
+
+
+def warm_up() -> dict:
+    """Load the crew engine and agent LLM clients; safe to call repeatedly and from any thread"""
+    with _warm_lock:
+        if _warm_state["status"] == "ready":
+            return dict(_warm_state)
+        _warm_state.update(status="warming", error=None)
+        started = time.perf_counter()
+        try:
+            import crewai  # noqa: F401
+            import crewai_tools  # noqa: F401
+            import orchestration.cache_adapters  # noqa: F401
+
+            research_specialist.get_academic_llm()
+            data_analyst.get_analytical_llm()
+            content_writer.get_publication_llm()
+        except Exception as e:
+            _warm_state.update(status="failed", error=str(e))
+            raise
+        _warm_state.update(status="ready", seconds=round(time.perf_counter() - started, 3))
+        return dict(_warm_state)
+
+
+def warm_state() -> dict:
+    return dict(_warm_state)
+
+
+def _chain_callbacks(callbacks: list) -> Callable[[Any], None]:
+    def on_task_complete(output: Any) -> None:
+        for callback in callbacks:
+            callback(output)
+    return on_task_complete
+
+
+def write_refreshed_findings(output_dir: str, refresh: RefreshBaseline, updates: str) -> None:
+    with open(os.path.join(output_dir, RESEARCH_OUTPUT_FILE), "w", encoding="utf-8") as f:
+        f.write(merge_updates(refresh.findings, updates, refresh.since_label))
+
+
+def _context_summarizer() -> Optional[Callable[[str, int], str]]:
+    if COMPACTION_SUMMARIZER != "llm":
+        return None
+    return llm_summarizer(data_analyst.get_analytical_llm())
+
+
+def build_research_crew(
+    research_id: str,
+    progress: Optional[ProgressTracker] = None,
+    stream: Optional["ManuscriptStream"] = None,
+    trace: Optional["RunTrace"] = None,
+    control: Optional["RunControl"] = None,
+    checkpoint: Optional["RunCheckpoint"] = None,
+    refresh: Optional[RefreshBaseline] = None
+) -> "Crew":
+    """
+    Build an isolated crew for a single research run
+    Agents, tasks and tools are created fresh so concurrent runs share no mutable state
+    When a progress tracker is given, every agent step and task completion is reported to it;
+    when a manuscript stream is given, streamed agent output is appended to its chunk log;
+    when a run trace is given, every LLM and tool call is recorded as a span;
+    when a run control is given, the crew stops at its next step once the run is cancelled or overdue;
+    when a checkpoint is given, each task's output is saved to it and the crew starts at the first task
+    without a saved output, handed the saved upstream outputs as context;
+    when a refresh baseline is given, research covers only material newer than that run and analysis
+    and writing revise its reports with the delta.
+    Analysis and writing receive their upstream context compacted to a token budget
+    """
+    warm_up()
+    from crewai import Crew
+
+    output_dir = get_output_dir(research_id)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # A refresh only looks for new material, which one research stream covers
+    width = 1 if refresh is not None else fanout_width()
+    if refresh is not None:
+        research_agents = [create_research_specialist_agent(refresh.since.date(), refresh.sources)]
+    else:
+        research_agents = [create_research_specialist_agent() for _ in range(width)]
+    data_analyst_agent = create_data_analyst_agent(output_dir)
+    content_writer_agent = create_content_writer_agent(output_dir)
+
+    refresh_since = refresh.since_label if refresh is not None else None
+    if refresh is not None:
+        research_tasks = [
+            create_research_refresh_task(research_agents[0], output_dir, refresh_since, refresh.prompt_sources())
+        ]
+    elif width == 1:
+        research_tasks = [create_research_task(research_agents[0], output_dir)]
+    else:
+        # Each facet gets its own agent: one agent cannot execute two async tasks at once
+        facets = RESEARCH_FACETS[:width]
+        research_tasks = [
+            create_research_subtask(agent, output_dir, facet) for agent, facet in zip(research_agents, facets)
+        ]
+    # Declared context only orders the tasks; the context actually handed over is set by the compactor below
+    research_task = research_tasks[0]
+    analysis_task = create_analysis_task(data_analyst_agent, research_task, output_dir, refresh_since)
+    writing_task = create_writing_task(content_writer_agent, research_task, analysis_task, output_dir, refresh_since)
+
+    if not CREW_VERBOSE:
+        for agent in research_agents + [data_analyst_agent, content_writer_agent]:
+            agent.verbose = False
+
+    stages = [("research_task", agent, task) for agent, task in zip(research_agents, research_tasks)]
+    stages += [("analysis_task", data_analyst_agent, analysis_task), ("writing_task", content_writer_agent, writing_task)]
+    merger = None
+    if width > 1:
+        merger = ResearchMerger(
+            [title for _, title, _ in RESEARCH_FACETS[:width]],
+            os.path.join(output_dir, RESEARCH_OUTPUT_FILE),
+        )
+
+    compactor = ContextCompactor(
+        summarize=_context_summarizer(),
+        on_compacted=progress.record_context if progress is not None else None,
+    )
+
+    done = checkpoint.completed(list(TASK_OUTPUT_FILES)) if checkpoint is not None else []
+
+    def research_text() -> str:
+        if "research_task" in done:
+            return checkpoint.output("research_task")
+        return merger.merged if merger is not None else research_task.output.raw
+
+    def analysis_text() -> str:
+        if "analysis_task" in done:
+            return checkpoint.output("analysis_task")
+        return analysis_task.output.raw
+
+    # Runs as each upstream stage finishes, before CrewAI assembles the next task's context
+    if refresh is None:
+        handoffs = {
+            "research_task": lambda output: compactor.prepare(
+                "analysis_task", analysis_task, [("Research Findings", research_text())]
+            ),
+            "analysis_task": lambda output: compactor.prepare(
+                "writing_task", writing_task,
+                [("Research Findings", research_text()), ("Analysis Report", analysis_text())]
+            ),
+        }
+    else:
+        # Refresh: the prior reports plus only the new findings, titled so the revision prompts can name them
+        updates_title = f"New Research Findings (since {refresh_since})"
+        handoffs = {
+            "research_task": lambda output: compactor.prepare(
+                "analysis_task", analysis_task,
+                [("Prior Analysis Report", refresh.analysis), (updates_title, research_text())],
+                labelled=True
+            ),
+            "analysis_task": lambda output: compactor.prepare(
+                "writing_task", writing_task,
+                [
+                    ("Existing Manuscript", refresh.report),
+                    (updates_title, research_text()),
+                    ("Revised Analysis Report", analysis_text()),
+                ],
+                labelled=True
+            ),
+        }
+    outputs = {
+        "research_task": research_text,
+        "analysis_task": analysis_text,
+        "writing_task": lambda: writing_task.output.raw,
+    }
+
+    merged_callbacks = []
+    for key, agent, task in stages:
+        callbacks = [handoffs[key]] if key in handoffs else []
+        step_callbacks = []
+        if control is not None:
+            # Checked first so a stopped run neither compacts nor reports the next stage
+            control.bind(key, task)
+            step_callbacks.append(control.step_callback(key))
+            callbacks.insert(0, control.task_callback(key))
+        if checkpoint is not None:
+            callbacks.insert(1 if control is not None else 0, checkpoint.task_callback(key, outputs[key]))
+        if refresh is not None and key == "research_task":
+            # The stage's output file stays cumulative so the next refresh starts from everything known
+            callbacks.insert(
+                len(callbacks) - 1, lambda output: write_refreshed_findings(output_dir, refresh, research_text())
+            )
+        if progress is not None:
+            step_callbacks.append(progress.step_callback(key))
+            callbacks.append(progress.task_callback(key))
+        if step_callbacks:
+            agent.step_callback = _chain_callbacks(step_callbacks)
+        if stream is not None:
+            stream.bind(key, task)
+            callbacks.append(lambda output, key=key: stream.task_complete(key))
+        if trace is not None:
+            trace.bind(key, task)
+        if merger is not None and key == "research_task":
+            # The research stage completes once, when the last parallel stream has been merged
+            merged_callbacks = callbacks
+            callbacks = [merger.subtask_callback(research_tasks.index(task))]
+        if callbacks:
+            task.callback = _chain_callbacks(callbacks)
+    if merger is not None:
+        merger.on_merged = _chain_callbacks(merged_callbacks)
+
+    # Resumed run: skip checkpointed stages and hand their saved outputs to the first stage that runs
+    stage_tasks = {"research_task": research_tasks, "analysis_task": [analysis_task], "writing_task": [writing_task]}
+    if len(done) == len(stage_tasks):
+        raise ValueError(f"Every task of {research_id} is already checkpointed; nothing to resume")
+    if done:
+        handoffs[done[-1]](None)
+    remaining = [(key, agent, task) for key, agent, task in stages if key not in done]
+
+    return Crew(
+        agents=list(dict.fromkeys(agent for _, agent, _ in remaining)),
+        tasks=[task for _, _, task in remaining],
+        verbose=CREW_VERBOSE
+    )
@@ -1,9 +1,13 @@
 from dotenv import load_dotenv
 load_dotenv()
-from crew import research_crew
+from datetime import datetime
+from crew import TASK_OUTPUT_FILES, build_research_crew, get_output_dir
+from orchestration.artifact_catalog import get_artifact_catalog
 
 def run(topic: str):
-    result = research_crew.kickoff(inputs={"topic": topic})
+    research_id = f"cli_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    result = build_research_crew(research_id).kickoff(inputs={"topic": topic})
+    get_artifact_catalog().index_run(research_id, get_output_dir(research_id), topic, TASK_OUTPUT_FILES)
 
     print("-"*50)
     print(result)
@@ -0,0 +1 @@
+# Orchestration package
@@ -0,0 +1,296 @@
+"""
+Module: Artifact Catalog
+Focus: Indexed Metadata for Run Outputs with O(page) Listing, Per-Run Lookup and Full-Text Search
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# --- Configuration & Environment Management ---
+ARTIFACT_CATALOG_PATH = os.getenv("ARTIFACT_CATALOG_PATH", os.path.join("data", "artifacts.db"))
+
+_COLUMNS = ("research_id", "filename", "topic", "task", "type", "size_bytes", "content_hash", "created_at")
+
+
+def artifact_type(filename: str) -> str:
+    name = filename.lower()
+    return "report" if "manuscript" in name or "report" in name else "data"
+
+
+# Highlight markers around matched terms in search snippets
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_TOKENS = 24
+
+
+def to_match_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query that cannot raise a syntax error
+    Every word becomes a quoted term (all must match); "quoted phrases" stay phrases and a trailing * keeps prefix search
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+        if phrase:
+            words = re.findall(r"\w+", phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+            continue
+        prefix = word.endswith("*")
+        for token in re.findall(r"\w+", word):
+            terms.append(f'"{token}"')
+        if prefix and terms and re.search(r"\w$", word.rstrip("*")):
+            terms[-1] += "*"
+    return " ".join(terms)
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCatalog:
+    """
+    One row per file under <output root>/<research_id>/, written when a run finishes
+    Listing reads a single index page instead of walking the output tree. The text of every task output
+    (findings, analysis, final report) also goes into an FTS5 index, re-tokenized only when its hash changes,
+    so search never opens a file.
+    """
+
+    def __init__(self, path: str = ARTIFACT_CATALOG_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                research_id  TEXT NOT NULL,
+                filename     TEXT NOT NULL,
+                topic        TEXT NOT NULL DEFAULT '',
+                task         TEXT NOT NULL DEFAULT '',
+                type         TEXT NOT NULL,
+                size_bytes   INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                created_at   REAL NOT NULL,
+                PRIMARY KEY (research_id, filename)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at)")
+        # The search row id is stable, so the FTS row of a document is found without scanning the index
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_documents (
+                id           INTEGER PRIMARY KEY,
+                research_id  TEXT NOT NULL,
+                filename     TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                UNIQUE (research_id, filename)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_text USING fts5(topic, body, tokenize='porter unicode61')"
+        )
+
+    def record(self, research_id: str, path: str, topic: str = "", task: str = "") -> dict:
+        """Catalog one file; task outputs are also (re)indexed for search when their content changed"""
+        stats = os.stat(path)
+        filename = os.path.basename(path)
+        body = None
+        if task:
+            with open(path, "rb") as f:
+                data = f.read()
+            content_hash = hashlib.sha256(data).hexdigest()
+            body = data.decode("utf-8", errors="replace")
+        else:
+            content_hash = hash_file(path)
+        row = (
+            research_id,
+            filename,
+            topic,
+            task,
+            artifact_type(filename),
+            stats.st_size,
+            content_hash,
+            stats.st_mtime,
+        )
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO artifacts ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    row,
+                )
+                if body is not None:
+                    self._index_text(research_id, filename, topic, content_hash, body)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return dict(zip(_COLUMNS, row))
+
+    def _index_text(self, research_id: str, filename: str, topic: str, content_hash: str, body: str) -> None:
+        """Replace the document's FTS row unless it already holds this exact content; caller holds the transaction"""
+        existing = self._conn.execute(
+            "SELECT id, content_hash FROM search_documents WHERE research_id = ? AND filename = ?",
+            (research_id, filename),
+        ).fetchone()
+        if existing is not None and existing["content_hash"] == content_hash:
+            return
+        if existing is None:
+            doc_id = self._conn.execute(
+                "INSERT INTO search_documents (research_id, filename, content_hash) VALUES (?, ?, ?)",
+                (research_id, filename, content_hash),
+            ).lastrowid
+        else:
+            doc_id = existing["id"]
+            self._conn.execute("UPDATE search_documents SET content_hash = ? WHERE id = ?", (content_hash, doc_id))
+            self._conn.execute("DELETE FROM search_text WHERE rowid = ?", (doc_id,))
+        self._conn.execute("INSERT INTO search_text (rowid, topic, body) VALUES (?, ?, ?)", (doc_id, topic, body))
+
+    def index_run(
+        self,
+        research_id: str,
+        run_dir: str,
+        topic: str = "",
+        task_files: Optional[Dict[str, str]] = None
+    ) -> List[dict]:
+        """
+        Catalog every file a run left in its output directory
+        `task_files` maps task keys to the filenames they write so each artifact is attributed to its task
+        """
+        if not os.path.isdir(run_dir):
+            return []
+        tasks_by_file = {filename: task for task, filename in (task_files or {}).items()}
+        entries = []
+        for entry in os.scandir(run_dir):
+            if entry.is_file() and not entry.name.startswith("."):
+                entries.append(self.record(research_id, entry.path, topic, tasks_by_file.get(entry.name, "")))
+        return entries
+
+    def backfill(self, output_root: str, task_files: Optional[Dict[str, str]] = None) -> int:
+        """One-off import of runs that finished before the catalog existed"""
+        if not os.path.isdir(output_root):
+            return 0
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT DISTINCT research_id FROM artifacts")}
+        count = 0
+        for entry in os.scandir(output_root):
+            if entry.is_dir() and entry.name not in known and not entry.name.startswith("."):
+                count += len(self.index_run(entry.name, entry.path, task_files=task_files))
+        self.backfill_search(output_root)
+        return count
+
+    def backfill_search(self, output_root: str) -> int:
+        """Index task outputs cataloged before full-text search existed"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT a.research_id, a.filename, a.topic, a.task FROM artifacts a
+                LEFT JOIN search_documents d ON d.research_id = a.research_id AND d.filename = a.filename
+                WHERE a.task != '' AND d.id IS NULL
+                """
+            ).fetchall()
+        count = 0
+        for row in rows:
+            path = os.path.join(output_root, row["research_id"], row["filename"])
+            if os.path.isfile(path):
+                self.record(row["research_id"], path, row["topic"], row["task"])
+                count += 1
+        return count
+
+    def get(self, research_id: str, filename: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM artifacts WHERE research_id = ? AND filename = ?", (research_id, filename)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list(self, research_id: Optional[str] = None, offset: int = 0, limit: int = 50) -> Tuple[int, List[dict]]:
+        """Newest first; filtering by research_id uses the primary key"""
+        where, params = ("WHERE research_id = ?", [research_id]) if research_id else ("", [])
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM artifacts {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM artifacts {where} ORDER BY created_at DESC, filename LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return total, [dict(row) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        research_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[int, List[dict]]:
+        """
+        Best BM25 matches first (topic hits weigh double), each with a highlighted snippet
+        `since`/`until` bound the artifact's created_at timestamp; an empty query matches nothing
+        """
+        match = to_match_query(query)
+        if not match:
+            return 0, []
+        where, params = ["search_text MATCH ?"], [match]
+        if research_id:
+            where.append("a.research_id = ?")
+            params.append(research_id)
+        if since is not None:
+            where.append("a.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("a.created_at < ?")
+            params.append(until)
+        sql_from = f"""
+            FROM search_text
+            JOIN search_documents d ON d.id = search_text.rowid
+            JOIN artifacts a ON a.research_id = d.research_id AND a.filename = d.filename
+            WHERE {' AND '.join(where)}
+        """
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) {sql_from}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT a.*, bm25(search_text, 2.0, 1.0) AS rank,
+                       snippet(search_text, 1, ?, ?, ' … ', {SNIPPET_TOKENS}) AS snippet
+                {sql_from}
+                ORDER BY rank, a.created_at DESC LIMIT ? OFFSET ?
+                """,
+                [SNIPPET_START, SNIPPET_END] + params + [limit, offset],
+            ).fetchall()
+        return total, [dict(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# --- Shared Instance ---
+_artifact_catalog: Optional[ArtifactCatalog] = None
+_artifact_catalog_lock = threading.Lock()
+
+
+def get_artifact_catalog() -> ArtifactCatalog:
+    global _artifact_catalog
+    with _artifact_catalog_lock:
+        if _artifact_catalog is None:
+            _artifact_catalog = ArtifactCatalog()
+        return _artifact_catalog
@@ -0,0 +1,237 @@
+"""
+Module: CrewAI Cache Adapters
+Focus: Search Tool and LLM Wrappers that Route CrewAI Calls Through the Shared Caches and Rate Limits
+"""
+
+import os
+import threading
+from contextlib import nullcontext
+from datetime import date
+from typing import Any, FrozenSet, Optional
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from crewai_tools import SerperDevTool
+from pydantic import Field
+
+from orchestration.llm_cache import LLM_CACHE_MODE, LLM_CACHE_MODES, LLMCache, LLMCacheMiss, get_llm_cache
+from orchestration.metrics import observe_search
+from orchestration.rate_limit import RATE_LIMIT_COMPLETION_TOKENS, get_rate_limiter, prompt_tokens, rate_limit_key
+from orchestration.search_cache import get_search_cache
+
+# --- Shared Serper Connection Pool ---
+# The stock tool opens a new connection per search; one keep-alive pool per process is reused by every crew
+SERPER_RATE_LIMIT_KEY = "serper"
+SERPER_POOL_SIZE = int(os.getenv("SERPER_POOL_SIZE", 16))
+SERPER_TIMEOUT_SECONDS = float(os.getenv("SERPER_TIMEOUT_SECONDS", 10))
+_serper_session: Optional[Any] = None
+_serper_session_lock = threading.Lock()
+
+
+def get_serper_session() -> Any:
+    global _serper_session
+    with _serper_session_lock:
+        if _serper_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=SERPER_POOL_SIZE))
+            _serper_session = session
+        return _serper_session
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool that serves repeated queries from the shared search cache and respects the Serper rate limit
+    Refresh runs set `published_after` to search only newer material and `exclude_links` to drop sources already cited
+    """
+
+    published_after: Optional[date] = None
+    exclude_links: FrozenSet[str] = frozenset()
+
+    def _run(self, **kwargs: Any) -> Any:
+        # Bound here rather than via super(CachedSerperDevTool, ...) so the module-level name can be swapped (benchmark stubs)
+        run = super()._run
+        query = kwargs.get("search_query") or kwargs.get("query")
+
+        def fetch() -> Any:
+            with observe_search():
+                return get_rate_limiter().call(SERPER_RATE_LIMIT_KEY, lambda: run(**kwargs))
+
+        if not query:
+            return self._drop_known(fetch())
+
+        params = {
+            "search_type": kwargs.get("search_type", self.search_type),
+            "n_results": self.n_results,
+            "country": self.country,
+            "location": self.location,
+            "locale": self.locale,
+        }
+        if self.published_after is not None:
+            # Only added when set so unrestricted searches keep their existing cache keys
+            params["published_after"] = self.published_after.isoformat()
+        return self._drop_known(get_search_cache().get_or_fetch(query, fetch, **params))
+
+    def _drop_known(self, results: Any) -> Any:
+        """Copy of the results without excluded links; the cached value is shared and stays untouched"""
+        if not self.exclude_links or not isinstance(results, dict):
+            return results
+        excluded = {link.rstrip("/") for link in self.exclude_links}
+        return {
+            name: [item for item in value if str(item.get("link", "")).rstrip("/") not in excluded]
+            if name in ("organic", "news") and isinstance(value, list) else value
+            for name, value in results.items()
+        }
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        payload = {"q": search_query, "num": self.n_results}
+        for name, value in (("gl", self.country), ("location", self.location), ("hl", self.locale)):
+            if value:
+                payload[name] = value
+        if self.published_after is not None:
+            # Google custom date range: results published on or after the date
+            day = self.published_after
+            payload["tbs"] = f"cdr:1,cd_min:{day.month}/{day.day}/{day.year}"
+        response = get_serper_session().post(
+            self._get_search_url(search_type),
+            headers={"X-API-KEY": os.environ["SERPER_API_KEY"], "content-type": "application/json"},
+            json=payload,
+            timeout=SERPER_TIMEOUT_SECONDS,
+        )
+        # A 429 raises HTTPError with the response attached, which the rate limiter backs off on
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return dict(results)
+
+
+class DelegatingLLM(BaseLLM):
+    """
+    Base for wrappers around a CrewAI LLM
+    Stop words the executor scopes to the wrapper are handed on to the wrapped client
+    """
+
+    inner: Any = Field(exclude=True)
+
+    def _call_inner(self, messages, **kwargs):
+        stop = self.stop_sequences
+        with call_stop_override(self.inner, stop) if stop else nullcontext():
+            return self.inner.call(messages, **kwargs)
+
+    def supports_function_calling(self) -> bool:
+        supports = getattr(self.inner, "supports_function_calling", None)
+        return bool(supports and supports())
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self.inner.get_token_usage_summary()
+
+
+class CachingLLM(DelegatingLLM):
+    """
+    Wraps any CrewAI LLM and answers repeated requests from the shared LLM cache
+    Only plain-text completions are cached; native tool-call responses always go to the model
+    """
+
+    mode: str = "readwrite"
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        cache = get_llm_cache()
+        stop = self.stop_sequences
+        key = LLMCache.make_key(
+            self.inner.model,
+            self.inner.temperature,
+            messages,
+            stop=stop,
+            tools=tools,
+            response_model=response_model.__name__ if response_model else None,
+        )
+
+        cached = cache.get(key)
+        if cached is not None:
+            cache.count("hits")
+            return cached
+        if self.mode == "replay":
+            cache.count("replay_misses")
+            raise LLMCacheMiss(f"No recorded completion for {self.inner.model} (replay mode)")
+
+        cache.count("misses")
+        completion = self._call_inner(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+        if isinstance(completion, str):
+            cache.set(key, completion, self.inner.model)
+        return completion
+
+
+class RateLimitedLLM(DelegatingLLM):
+    """
+    Wraps any CrewAI LLM so its calls draw from the shared rate limit of its model or provider
+    A 429 pauses every caller of that limit, then the call is retried
+    """
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        prompt = prompt_tokens(messages)
+
+        def used_tokens(completion: Any) -> int:
+            return prompt + (prompt_tokens(completion) if isinstance(completion, str) else RATE_LIMIT_COMPLETION_TOKENS)
+
+        return get_rate_limiter().call(
+            rate_limit_key(self.inner.model),
+            lambda: self._call_inner(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model,
+            ),
+            tokens=prompt + RATE_LIMIT_COMPLETION_TOKENS,
+            used_tokens=used_tokens,
+        )
+
+
+def with_rate_limit(llm: BaseLLM) -> BaseLLM:
+    """Wrap an agent LLM in the shared rate limit; wrap the result in the cache so cache hits spend no capacity"""
+    return RateLimitedLLM(model=llm.model, temperature=llm.temperature, inner=llm)
+
+
+def with_llm_cache(llm: BaseLLM, mode: str = LLM_CACHE_MODE) -> BaseLLM:
+    """Wrap an agent LLM according to LLM_CACHE_MODE; returns it unchanged when caching is off"""
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(f"Unknown LLM_CACHE_MODE: {mode!r} (expected one of {LLM_CACHE_MODES})")
+    if mode == "off":
+        return llm
+    return CachingLLM(model=llm.model, temperature=llm.temperature, inner=llm, mode=mode)
@@ -0,0 +1,70 @@
+"""
+Module: Run Checkpoints
+Focus: Durable Per-Task Outputs so a Failed Run Resumes from its First Incomplete Task
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# --- Configuration & Environment Management ---
+# One JSON document per run, rewritten as each task completes and removed once the run succeeds
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", os.path.join("data", "checkpoints"))
+
+
+def checkpoint_path(research_id: str, checkpoint_dir: str = CHECKPOINT_DIR) -> str:
+    return os.path.join(checkpoint_dir, f"{research_id}.json")
+
+
+class RunCheckpoint:
+    """
+    Raw output of every completed task of one run
+    Each save replaces the file atomically, so a crash never leaves a half-written checkpoint behind
+    """
+
+    def __init__(self, research_id: str, checkpoint_dir: str = CHECKPOINT_DIR):
+        self.research_id = research_id
+        self.path = checkpoint_path(research_id, checkpoint_dir)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.tasks: Dict[str, dict] = json.load(f)
+        except FileNotFoundError:
+            self.tasks = {}
+
+    def output(self, task_key: str) -> Optional[str]:
+        task = self.tasks.get(task_key)
+        return task["raw"] if task else None
+
+    def completed(self, task_keys: Sequence[str]) -> List[str]:
+        """The leading run of `task_keys` that is checkpointed; everything after it has to run again"""
+        done: List[str] = []
+        for key in task_keys:
+            if key not in self.tasks:
+                break
+            done.append(key)
+        return done
+
+    def save(self, task_key: str, raw: str) -> None:
+        with self._lock:
+            self.tasks[task_key] = {"raw": raw, "completed_at": datetime.now().isoformat()}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.tasks, f)
+            os.replace(temp_path, self.path)
+
+    def task_callback(self, task_key: str, text: Callable[[], str]) -> Callable[[Any], None]:
+        def on_task_complete(output: Any) -> None:
+            self.save(task_key, text())
+        return on_task_complete
+
+    def clear(self) -> None:
+        with self._lock:
+            self.tasks = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
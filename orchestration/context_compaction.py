@@ -0,0 +1,302 @@
+"""
+Module: Inter-Stage Context Compaction
+Focus: Token-Budgeted, Deduplicated Hand-off of Upstream Outputs with Intact Source References
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple
+
+# --- Configuration & Environment Management ---
+# Token budget for the upstream context each task receives; 0 hands it over uncompacted
+CONTEXT_TOKEN_BUDGETS = {
+    "analysis_task": int(os.getenv("ANALYSIS_CONTEXT_TOKENS", 6000)),
+    "writing_task": int(os.getenv("WRITING_CONTEXT_TOKENS", 9000)),
+}
+# Oversized context is summarized in chunks of about this size, several chunks at a time
+COMPACTION_CHUNK_TOKENS = int(os.getenv("COMPACTION_CHUNK_TOKENS", 1500))
+COMPACTION_WORKERS = int(os.getenv("COMPACTION_WORKERS", 4))
+# "llm" summarizes chunks with the analyst model; "extractive" keeps the most evidence-dense sentences without a model call
+COMPACTION_SUMMARIZER = os.getenv("COMPACTION_SUMMARIZER", "llm").lower()
+# Paragraphs sharing at least this fraction of their word shingles with an earlier one are dropped as repeats
+DUPLICATE_THRESHOLD = float(os.getenv("CONTEXT_DUPLICATE_THRESHOLD", 0.8))
+
+# CrewAI joins context from several tasks with this divider; uncompacted hand-offs keep the same shape
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+_URL = re.compile(r"https?://[^\s)\]>\"']+")
+_WORD = re.compile(r"[a-z0-9]+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\[(])")
+_CITATION = re.compile(r"\[\d+\]|\(\w[^()]*\d{4}\)|doi\.org|\bet al\b", re.IGNORECASE)
+
+SUMMARY_PROMPT = """Condense the following research context to at most {target_tokens} tokens for another analyst.
+Keep every number, statistic, date, named source, citation marker and URL exactly as written.
+Drop repetition, filler and methodology boilerplate. Reply with the condensed text only.
+
+{text}"""
+
+
+# --- Token Counting ---
+_encoding: Any = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """tiktoken's cl100k_base when its vocabulary is available, otherwise about four characters per token"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    if _encoding is None:
+        return (len(text) + 3) // 4
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+# --- Deduplication ---
+def word_shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def split_blocks(text: str) -> List[str]:
+    """Paragraphs and individual list items are the unit of deduplication"""
+    blocks: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        lines = [line for line in paragraph.splitlines() if line.strip()]
+        if lines and all(re.match(r"\s*([-*+]|\d+[.)])\s", line) for line in lines):
+            blocks.extend(lines)
+        elif lines:
+            blocks.append("\n".join(lines))
+    return blocks
+
+
+def is_heading(block: str) -> bool:
+    return block.lstrip().startswith("#")
+
+
+def extract_references(text: str) -> List[str]:
+    """Every cited URL, in order of first appearance"""
+    return list(dict.fromkeys(url.rstrip(".,;:") for url in _URL.findall(text)))
+
+
+class BlockDeduplicator:
+    """
+    Remembers every block it has accepted
+    A block is a repeat when it matches an earlier one exactly, overlaps it in most word shingles,
+    or is a short passage whose sources have all been cited already
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.kept = 0
+        self.dropped = 0
+        self._exact: Set[str] = set()
+        self._shingles: List[Set[Tuple[str, ...]]] = []
+        self._urls: Set[str] = set()
+
+    def accept(self, block: str) -> bool:
+        normalized = " ".join(_WORD.findall(block.lower()))
+        if not normalized:
+            return False
+        urls = set(_URL.findall(block))
+        shingles = word_shingles(block)
+        is_repeat = normalized in self._exact or bool(urls and urls <= self._urls and len(normalized) < 300)
+        if not is_repeat and shingles:
+            for previous in self._shingles:
+                if len(shingles & previous) / min(len(shingles), len(previous)) >= self.threshold:
+                    is_repeat = True
+                    break
+        if is_repeat:
+            self.dropped += 1
+            return False
+
+        self.kept += 1
+        self._exact.add(normalized)
+        self._urls |= urls
+        if shingles:
+            self._shingles.append(shingles)
+        return True
+
+
+# --- Summarization ---
+def extractive_summary(text: str, target_tokens: int) -> str:
+    """Keep headings and the sentences carrying numbers, citations and URLs, in their original order"""
+    kept: List[Tuple[int, str]] = []
+    candidates: List[Tuple[float, int, str]] = []
+    position = 0
+    for block in split_blocks(text):
+        if is_heading(block):
+            kept.append((position, block))
+            position += 1
+            continue
+        for index, sentence in enumerate(_SENTENCE.split(block)):
+            score = 1.0 if index == 0 else 0.0
+            score += 3.0 if _URL.search(sentence) else 0.0
+            score += 2.0 if _CITATION.search(sentence) else 0.0
+            score += 2.0 if re.search(r"\d", sentence) else 0.0
+            candidates.append((score, position, sentence.strip()))
+            position += 1
+
+    used = sum(count_tokens(block) for _, block in kept)
+    seen: Set[str] = set()
+    for score, pos, sentence in sorted(candidates, key=lambda item: (-item[0], item[1])):
+        normalized = " ".join(_WORD.findall(sentence.lower()))
+        cost = count_tokens(sentence)
+        if not normalized or normalized in seen or used + cost > target_tokens:
+            continue
+        seen.add(normalized)
+        kept.append((pos, sentence))
+        used += cost
+    return "\n\n".join(sentence for _, sentence in sorted(kept))
+
+
+def llm_summarizer(llm: Any) -> Callable[[str, int], str]:
+    def summarize(text: str, target_tokens: int) -> str:
+        reply = llm.call([{"role": "user", "content": SUMMARY_PROMPT.format(target_tokens=target_tokens, text=text)}])
+        # The cached agent LLMs may still answer in the ReAct format they use inside a crew
+        return str(reply).split("Final Answer:", 1)[-1].strip()
+    return summarize
+
+
+def _chunk_blocks(blocks: Sequence[str], chunk_tokens: int) -> List[str]:
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for block in blocks:
+        cost = count_tokens(block)
+        if current and size + cost > chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(block)
+        size += cost
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def compact_context(
+    sections: Sequence[Tuple[str, str]],
+    budget: int,
+    summarize: Optional[Callable[[str, int], str]] = None,
+    labelled: bool = False
+) -> Tuple[str, dict]:
+    """
+    Fit (title, text) upstream outputs into `budget` tokens
+    Repeats are dropped first; only if that is not enough are chunks summarized, in parallel.
+    Every source URL of the input is still listed in the output, under "Sources" if a summary dropped it.
+    Uncompacted context keeps CrewAI's shape unless `labelled`, which titles each section as compaction does
+    """
+    if labelled:
+        raw = "\n\n".join(f"## {title}\n\n{text}" for title, text in sections if (text or "").strip())
+    else:
+        raw = CONTEXT_DIVIDER.join(text for _, text in sections)
+    tokens_in = count_tokens(raw)
+    stats = {
+        "budget_tokens": budget,
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_in,
+        "compaction_ratio": 1.0,
+        "duplicates_dropped": 0,
+        "chunks_summarized": 0,
+        "references": 0,
+    }
+    if budget <= 0:
+        return raw, stats
+
+    deduplicator = BlockDeduplicator()
+    parts: List[Tuple[str, List[str]]] = []
+    for title, text in sections:
+        blocks = [block for block in split_blocks(text or "") if is_heading(block) or deduplicator.accept(block)]
+        parts.append((title, blocks))
+    references = extract_references(raw)
+    stats.update(duplicates_dropped=deduplicator.dropped, references=len(references))
+
+    def render(rendered: Sequence[Tuple[str, str]]) -> str:
+        return "\n\n".join(f"## {title}\n\n{body}" for title, body in rendered if body.strip())
+
+    if deduplicator.dropped == 0 and tokens_in <= budget:
+        return raw, stats
+
+    compacted = render([(title, "\n\n".join(blocks)) for title, blocks in parts])
+    if count_tokens(compacted) > budget:
+        reference_tokens = count_tokens("\n".join(references))
+        available = max(budget - reference_tokens - 16 * len(parts), budget // 4)
+        body_tokens = sum(count_tokens(block) for _, blocks in parts for block in blocks) or 1
+        ratio = min(1.0, available / body_tokens)
+
+        jobs = []
+        for index, (title, blocks) in enumerate(parts):
+            for chunk in _chunk_blocks(blocks, COMPACTION_CHUNK_TOKENS):
+                jobs.append((index, chunk, max(32, int(count_tokens(chunk) * ratio))))
+
+        def shrink(job: Tuple[int, str, int]) -> str:
+            _, chunk, target = job
+            if summarize is not None:
+                try:
+                    summary = summarize(chunk, target)
+                    if summary and count_tokens(summary) <= target * 1.2:
+                        return summary
+                except Exception as e:
+                    print(f"Context summarization failed, keeping key sentences instead: {e}")
+            return extractive_summary(chunk, target)
+
+        with ThreadPoolExecutor(max_workers=max(1, COMPACTION_WORKERS)) as pool:
+            summaries = list(pool.map(shrink, jobs))
+        bodies: List[List[str]] = [[] for _ in parts]
+        for (index, _, _), summary in zip(jobs, summaries):
+            bodies[index].append(summary)
+        compacted = render([(title, "\n\n".join(bodies[index])) for index, (title, _) in enumerate(parts)])
+        missing = [url for url in references if url not in compacted]
+        if missing:
+            compacted += "\n\n## Sources\n\n" + "\n".join(f"- {url}" for url in missing)
+        stats["chunks_summarized"] = len(jobs)
+
+    tokens_out = count_tokens(compacted)
+    stats.update(tokens_out=tokens_out, compaction_ratio=round(tokens_out / tokens_in, 3) if tokens_in else 1.0)
+    return compacted, stats
+
+
+# --- CrewAI Hand-off ---
+class ContextCompactor:
+    """
+    Replaces a task's upstream context with a compacted copy just before the task starts
+    CrewAI builds context from `task.output.raw` of every task in `task.context`, so the consumer is
+    pointed at a detached carrier task; the upstream outputs and their files stay untouched
+    """
+
+    def __init__(
+        self,
+        summarize: Optional[Callable[[str, int], str]] = None,
+        on_compacted: Optional[Callable[[str, dict], None]] = None
+    ):
+        self.summarize = summarize
+        self.on_compacted = on_compacted
+        self.stats: dict = {}
+
+    def prepare(self, task_key: str, task: Any, sections: Sequence[Tuple[str, str]], labelled: bool = False) -> dict:
+        from crewai import Task
+        from crewai.tasks.task_output import TaskOutput
+
+        budget = CONTEXT_TOKEN_BUDGETS.get(task_key, 0)
+        text, stats = compact_context(sections, budget, self.summarize, labelled)
+        carrier = Task(description=f"Upstream context for {task_key}", expected_output="Context")
+        carrier.output = TaskOutput(description=carrier.description, raw=text, agent="Context Compactor")
+        task.context = [carrier]
+
+        self.stats[task_key] = stats
+        if budget > 0:
+            print(
+                f"Context for {task_key}: {stats['tokens_in']} -> {stats['tokens_out']} tokens "
+                f"(ratio {stats['compaction_ratio']}, {stats['duplicates_dropped']} duplicates dropped)"
+            )
+        if self.on_compacted is not None:
+            self.on_compacted(task_key, stats)
+        return stats
@@ -0,0 +1,32 @@
+"""
+Module: Submission Coalescing
+Focus: Recognising Identical Research Requests So One Crew Run Serves Them All
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+# --- Configuration & Environment Management ---
+# A completed run is handed back for identical submissions for this long; 0 only coalesces in-flight runs.
+RESULT_REUSE_SECONDS = int(os.getenv("RESULT_REUSE_SECONDS", 60 * 60))
+
+
+def normalize_topic(topic: str) -> str:
+    """Case, spacing and trailing punctuation never change what the crew researches"""
+    return re.sub(r"\s+", " ", topic).strip().rstrip(".?!").strip().lower()
+
+
+def make_dedupe_key(topic: str, crew_config: dict) -> str:
+    material = json.dumps({"topic": normalize_topic(topic), "crew": crew_config}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def reuse_cutoff(reuse_seconds: int = RESULT_REUSE_SECONDS) -> Optional[str]:
+    """Oldest finished_at still considered fresh, or None when result reuse is disabled"""
+    if reuse_seconds <= 0:
+        return None
+    return (datetime.now() - timedelta(seconds=reuse_seconds)).isoformat()
@@ -0,0 +1,95 @@
+"""
+Module: Research Event Bus
+Focus: Push-Based Status Delivery to WebSocket and SSE Subscribers
+"""
+
+import asyncio
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+# --- Configuration & Environment Management ---
+# Slow consumers only need the latest state, so a full subscriber queue drops its oldest event.
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 100))
+
+
+class Subscription:
+    """
+    A single subscriber's view of one research_id's event stream
+    Use as an async context manager so the subscription is always released
+    """
+
+    def __init__(self, bus: "EventBus", research_id: str, maxsize: int):
+        self.bus = bus
+        self.research_id = research_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    async def __aenter__(self) -> "Subscription":
+        self.bus._add(self)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.bus._discard(self)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe keyed by research_id
+    publish() may be called from worker threads; delivery always happens on the bound event loop
+    """
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def subscribe(self, research_id: str) -> Subscription:
+        return Subscription(self, research_id, self.queue_size)
+
+    def _add(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers[subscription.research_id].add(subscription)
+
+    def _discard(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.research_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.research_id]
+
+    def _deliver(self, research_id: str, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(research_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def publish(self, research_id: str, event: dict) -> None:
+        with self._lock:
+            if research_id not in self._subscribers:
+                return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._deliver, research_id, event)
+
+    def subscribed_ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._subscribers)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
@@ -0,0 +1,72 @@
+"""
+Module: Parallel Research Fan-Out
+Focus: Concurrent Research Streams Merged into One Deduplicated Context for Analysis
+"""
+
+import os
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from orchestration.context_compaction import BlockDeduplicator, is_heading, split_blocks
+
+# --- Configuration & Environment Management ---
+# 1 keeps the single sequential research task; 2+ runs that many facet streams concurrently (max 6).
+RESEARCH_FANOUT_WIDTH = int(os.getenv("RESEARCH_FANOUT_WIDTH", 1))
+
+
+def merge_findings(sections: Sequence[Tuple[str, str]]) -> Tuple[str, dict]:
+    """
+    Merge (title, text) research streams into one document
+    Repeated paragraphs and repeated source URLs are kept only where they first appear
+    """
+    deduplicator = BlockDeduplicator()
+    parts = [f"# Research Findings ({len(sections)} parallel research streams, deduplicated)"]
+    for title, text in sections:
+        section: List[str] = [
+            block for block in split_blocks(text or "") if is_heading(block) or deduplicator.accept(block)
+        ]
+        if any(not is_heading(block) for block in section):
+            parts.append(f"## {title}\n\n" + "\n\n".join(section))
+
+    stats = {"streams": len(sections), "blocks_kept": deduplicator.kept, "blocks_dropped": deduplicator.dropped}
+    return "\n\n".join(parts) + "\n", stats
+
+
+class ResearchMerger:
+    """
+    Joins the parallel research sub-tasks back into a single research stage
+    The last sub-task to finish writes the merged findings to the stage's output file and keeps them
+    in `merged`, which is the research context handed to analysis and writing
+    """
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        output_path: str,
+        on_merged: Optional[Callable[[Any], None]] = None
+    ):
+        self.titles = list(titles)
+        self.output_path = output_path
+        self.on_merged = on_merged
+        self.merged: Optional[str] = None
+        self.stats: dict = {}
+        self._lock = threading.Lock()
+        self._outputs: dict = {}
+
+    def subtask_callback(self, index: int) -> Callable[[Any], None]:
+        def on_subtask_complete(output: Any) -> None:
+            with self._lock:
+                self._outputs[index] = output
+                if len(self._outputs) < len(self.titles):
+                    return
+                sections = [(self.titles[i], self._outputs[i].raw) for i in range(len(self.titles))]
+                self.merged, self.stats = merge_findings(sections)
+                with open(self.output_path, "w", encoding="utf-8") as f:
+                    f.write(self.merged)
+            print(
+                f"Research fan-out merged {self.stats['streams']} streams: "
+                f"kept {self.stats['blocks_kept']} blocks, dropped {self.stats['blocks_dropped']} duplicates"
+            )
+            if self.on_merged is not None:
+                self.on_merged(output)
+        return on_subtask_complete
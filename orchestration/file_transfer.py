@@ -0,0 +1,134 @@
+"""
+Module: Artifact File Transfer
+Focus: Chunked Raw Downloads with Range, Conditional Requests and gzip/brotli Negotiation
+"""
+
+import hashlib
+import os
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterator, Mapping, Optional
+from urllib.parse import quote
+
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# --- Configuration & Environment Management ---
+# Files below this size are sent as-is: compression overhead outweighs the savings
+DOWNLOAD_COMPRESS_MIN_BYTES = int(os.getenv("DOWNLOAD_COMPRESS_MIN_BYTES", 1024))
+DOWNLOAD_CHUNK_BYTES = int(os.getenv("DOWNLOAD_CHUNK_BYTES", 64 * 1024))
+
+MEDIA_TYPES = {".md": "text/markdown; charset=utf-8", ".txt": "text/plain; charset=utf-8"}
+
+
+def make_etag(stat_result: os.stat_result, content_hash: Optional[str] = None) -> str:
+    """Strong validator from the catalogued SHA-256, or from mtime and size when the file is not catalogued"""
+    if content_hash:
+        return f'"{content_hash}"'
+    basis = f"{stat_result.st_mtime}-{stat_result.st_size}"
+    return f'"{hashlib.md5(basis.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    """RFC 9110 precedence: If-None-Match wins, If-Modified-Since only applies without it"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        # Compressed variants carry a suffix inside the quotes; any representation of the same bytes matches
+        base = etag.strip('"')
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/").strip('"').split("-")[0] == base:
+                return True
+        return False
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick brotli when the client accepts it and the optional package is installed, else gzip"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compressed_chunks(path: str, encoding: str, chunk_size: int = DOWNLOAD_CHUNK_BYTES) -> Iterator[bytes]:
+    """Compress a file incrementally so only one chunk is ever held in memory"""
+    if encoding == "br":
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+        compress, flush = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compress, flush = compressor.compress, compressor.flush
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            data = compress(chunk)
+            if data:
+                yield data
+    yield flush()
+
+
+def build_file_response(
+    headers: Mapping[str, str],
+    path: str,
+    filename: str,
+    content_hash: Optional[str] = None
+) -> Response:
+    """
+    Serve an artifact as raw bytes
+    Conditional requests get 304, Range requests get identity bytes, everything else may be compressed
+    """
+    stat_result = os.stat(path)
+    etag = make_etag(stat_result, content_hash)
+    media_type = MEDIA_TYPES.get(os.path.splitext(filename)[1].lower(), "application/octet-stream")
+    common = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": "no-cache",
+        "vary": "Accept-Encoding",
+    }
+
+    if is_not_modified(headers, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=common)
+
+    encoding = None
+    if "range" not in headers and stat_result.st_size >= DOWNLOAD_COMPRESS_MIN_BYTES:
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+
+    if encoding is None:
+        # Starlette handles Range / If-Range and streams the file in chunks
+        return FileResponse(
+            path, headers=common, media_type=media_type, filename=filename, stat_result=stat_result
+        )
+
+    common.update({
+        "etag": f'{etag[:-1]}-{encoding}"',
+        "content-encoding": encoding,
+        "content-disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+    })
+    return StreamingResponse(compressed_chunks(path, encoding), headers=common, media_type=media_type)
@@ -0,0 +1,592 @@
+"""
+Module: Durable Job Queue
+Focus: Crash-Safe Hand-off Between the API and Research Workers
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+# --- Configuration & Environment Management ---
+# The default backend is a local SQLite file so durability needs no external service.
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "sqlite")
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join("data", "jobs.db"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 120))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+# Higher priority is claimed first; a waiting job gains one priority level per this many seconds so none starves (0 disables)
+JOB_PRIORITY_AGING_SECONDS = float(os.getenv("JOB_PRIORITY_AGING_SECONDS", 600))
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled", "timed_out")
+# Finished without a result; such a job can be queued again and resumes from its checkpoint
+RESUMABLE_STATUSES = ("failed", "cancelled", "timed_out")
+
+
+@dataclass
+class Job:
+    research_id: str
+    topic: str
+    status: str = "queued"
+    progress: int = 0
+    current_agent: Optional[str] = None
+    current_task: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    stages: dict = field(default_factory=dict)
+    payload: dict = field(default_factory=dict)
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires: Optional[float] = None
+    error: Optional[str] = None
+    result_path: Optional[str] = None
+    dedupe_key: Optional[str] = None
+    cancel_requested: int = 0
+    priority: int = 0
+    client_id: Optional[str] = None
+    batch_id: Optional[str] = None
+    created_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class JobQueue(ABC):
+    """
+    Backend contract for research jobs
+    Workers claim jobs under a lease; a job whose lease lapses is handed to the next worker.
+    Claims go to the highest priority first and, within a priority, to the client with the fewest running jobs
+    """
+
+    @abstractmethod
+    def enqueue(
+        self,
+        research_id: str,
+        topic: str,
+        payload: Optional[dict] = None,
+        dedupe_key: Optional[str] = None,
+        priority: int = 0,
+        client_id: Optional[str] = None,
+        batch_id: Optional[str] = None
+    ) -> Job:
+        ...
+
+    @abstractmethod
+    def enqueue_unique(
+        self,
+        research_id: str,
+        topic: str,
+        dedupe_key: str,
+        completed_since: Optional[str] = None,
+        reusable: Optional[Callable[[Job], bool]] = None,
+        payload: Optional[dict] = None,
+        priority: int = 0,
+        client_id: Optional[str] = None,
+        batch_id: Optional[str] = None
+    ) -> Tuple[Job, bool]:
+        """
+        Atomically return the job find_duplicate would, or enqueue a new one when there is none
+        `reusable` may reject that duplicate (e.g. a completed job whose result is gone). Returns (job, created)
+        """
+        ...
+
+    @abstractmethod
+    def create_batch(self, batch_id: str, research_ids: Sequence[str], client_id: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def get_batch(self, batch_id: str) -> Optional[Tuple[dict, List[Job]]]:
+        """The batch record and its jobs in submission order, None if unknown"""
+        ...
+
+    @abstractmethod
+    def queue_depth(self, batched: bool) -> int:
+        """Queued jobs submitted in batches (True) or one at a time (False)"""
+        ...
+
+    @abstractmethod
+    def find_duplicate(self, dedupe_key: str, completed_since: Optional[str] = None) -> Optional[Job]:
+        """
+        Newest job with the same key that is still queued or running,
+        or that completed at or after `completed_since` (ISO timestamp; None skips completed jobs)
+        """
+        ...
+
+    @abstractmethod
+    def latest_completed(self, dedupe_key: str) -> Optional[Job]:
+        """Most recently finished completed job with the same key, however old; the base of a refresh run"""
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def heartbeat(
+        self,
+        research_id: str,
+        worker_id: str,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        attempt: Optional[int] = None
+    ) -> bool:
+        """Extend the lease; False once the job is no longer running under this worker's claim"""
+        ...
+
+    # Worker-side writes pass the worker_id (and attempt) of their claim: once the lease lapsed and the job was
+    # claimed again, they change nothing and return False, so a stale crew cannot overwrite the new owner's job
+    @abstractmethod
+    def update(self, research_id: str, worker_id: Optional[str] = None, attempt: Optional[int] = None, **fields) -> bool:
+        ...
+
+    @abstractmethod
+    def complete(
+        self,
+        research_id: str,
+        result_path: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        attempt: Optional[int] = None
+    ) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(
+        self,
+        research_id: str,
+        error: str,
+        status: str = "failed",
+        worker_id: Optional[str] = None,
+        attempt: Optional[int] = None
+    ) -> bool:
+        ...
+
+    @abstractmethod
+    def cancel(self, research_id: str) -> Optional[str]:
+        """
+        Cancel a queued job outright, or flag a running one for its worker to stop at the next step
+        Returns the job's status afterwards ("cancelling" while a worker is still stopping), None if unknown
+        """
+        ...
+
+    @abstractmethod
+    def is_cancel_requested(self, research_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def requeue(self, research_id: str) -> bool:
+        """Queue a failed, cancelled or timed-out job again with a fresh attempt budget; False if it is not resumable"""
+        ...
+
+    @abstractmethod
+    def get(self, research_id: str) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    SQLite-backed queue shared by the API and any number of worker processes on the same host
+    Claims run inside BEGIN IMMEDIATE so two workers can never take the same job
+    """
+
+    _UPDATABLE = (
+        "status", "progress", "current_agent", "current_task", "elapsed_seconds", "stages",
+        "error", "result_path", "started_at", "finished_at",
+    )
+    _JSON_FIELDS = ("payload", "stages")
+    # Columns added after the first release, created on startup for existing databases
+    _MIGRATIONS = {
+        "current_task": "TEXT",
+        "elapsed_seconds": "REAL NOT NULL DEFAULT 0",
+        "stages": "TEXT NOT NULL DEFAULT '{}'",
+        "dedupe_key": "TEXT",
+        "cancel_requested": "INTEGER NOT NULL DEFAULT 0",
+        "priority": "INTEGER NOT NULL DEFAULT 0",
+        "client_id": "TEXT",
+        "batch_id": "TEXT",
+    }
+
+    def __init__(
+        self,
+        path: str = JOB_QUEUE_PATH,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        priority_aging: float = JOB_PRIORITY_AGING_SECONDS
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.priority_aging = priority_aging
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                research_id   TEXT PRIMARY KEY,
+                topic         TEXT NOT NULL,
+                status        TEXT NOT NULL,
+                progress      INTEGER NOT NULL DEFAULT 0,
+                current_agent TEXT,
+                payload       TEXT NOT NULL DEFAULT '{}',
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                worker_id     TEXT,
+                lease_expires REAL,
+                error         TEXT,
+                result_path   TEXT,
+                created_at    TEXT NOT NULL,
+                started_at    TEXT,
+                finished_at   TEXT
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in self._MIGRATIONS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key, created_at)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS batches (
+                batch_id     TEXT PRIMARY KEY,
+                client_id    TEXT,
+                research_ids TEXT NOT NULL,
+                created_at   TEXT NOT NULL
+            )
+            """
+        )
+
+    def _row_to_job(self, row: sqlite3.Row) -> Job:
+        data = dict(row)
+        for name in self._JSON_FIELDS:
+            data[name] = json.loads(data[name] or "{}")
+        return Job(**data)
+
+    def enqueue(
+        self,
+        research_id: str,
+        topic: str,
+        payload: Optional[dict] = None,
+        dedupe_key: Optional[str] = None,
+        priority: int = 0,
+        client_id: Optional[str] = None,
+        batch_id: Optional[str] = None
+    ) -> Job:
+        job = Job(
+            research_id=research_id,
+            topic=topic,
+            payload=payload or {},
+            dedupe_key=dedupe_key,
+            priority=priority,
+            client_id=client_id,
+            batch_id=batch_id,
+            created_at=datetime.now().isoformat(),
+        )
+        with self._lock:
+            self._insert(job)
+        return job
+
+    def enqueue_unique(
+        self,
+        research_id: str,
+        topic: str,
+        dedupe_key: str,
+        completed_since: Optional[str] = None,
+        reusable: Optional[Callable[[Job], bool]] = None,
+        payload: Optional[dict] = None,
+        priority: int = 0,
+        client_id: Optional[str] = None,
+        batch_id: Optional[str] = None
+    ) -> Tuple[Job, bool]:
+        # One write transaction for the lookup and the insert, so concurrent identical submissions
+        # (from any process) cannot both miss each other and both enqueue
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._find_duplicate_row(dedupe_key, completed_since)
+                duplicate = self._row_to_job(row) if row else None
+                if duplicate is not None and (reusable is None or reusable(duplicate)):
+                    self._conn.execute("COMMIT")
+                    return duplicate, False
+                job = Job(
+                    research_id=research_id,
+                    topic=topic,
+                    payload=payload or {},
+                    dedupe_key=dedupe_key,
+                    priority=priority,
+                    client_id=client_id,
+                    batch_id=batch_id,
+                    created_at=datetime.now().isoformat(),
+                )
+                self._insert(job)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job, True
+
+    def _insert(self, job: Job) -> None:
+        """Caller holds self._lock"""
+        self._conn.execute(
+            "INSERT INTO jobs (research_id, topic, status, payload, dedupe_key, priority, client_id, batch_id, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job.research_id, job.topic, job.status, json.dumps(job.payload), job.dedupe_key,
+                job.priority, job.client_id, job.batch_id, job.created_at,
+            ),
+        )
+
+    def create_batch(self, batch_id: str, research_ids: Sequence[str], client_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO batches (batch_id, client_id, research_ids, created_at) VALUES (?, ?, ?, ?)",
+                (batch_id, client_id, json.dumps(list(research_ids)), datetime.now().isoformat()),
+            )
+
+    def get_batch(self, batch_id: str) -> Optional[Tuple[dict, List[Job]]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM batches WHERE batch_id = ?", (batch_id,)).fetchone()
+            if row is None:
+                return None
+            batch = dict(row)
+            batch["research_ids"] = json.loads(batch["research_ids"])
+            placeholders = ", ".join("?" for _ in batch["research_ids"])
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs WHERE research_id IN ({placeholders})", batch["research_ids"]
+            ).fetchall()
+        jobs = {row["research_id"]: self._row_to_job(row) for row in rows}
+        return batch, [jobs[research_id] for research_id in batch["research_ids"] if research_id in jobs]
+
+    def queue_depth(self, batched: bool) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND batch_id IS " + ("NOT NULL" if batched else "NULL")
+            ).fetchone()
+        return row[0]
+
+    def find_duplicate(self, dedupe_key: str, completed_since: Optional[str] = None) -> Optional[Job]:
+        with self._lock:
+            row = self._find_duplicate_row(dedupe_key, completed_since)
+        return self._row_to_job(row) if row else None
+
+    def _find_duplicate_row(self, dedupe_key: str, completed_since: Optional[str]) -> Optional[sqlite3.Row]:
+        return self._conn.execute(
+            "SELECT * FROM jobs WHERE dedupe_key = ? "
+            "AND cancel_requested = 0 AND (status IN ('queued', 'running') OR (status = 'completed' AND finished_at >= ?)) "
+            "ORDER BY created_at DESC LIMIT 1",
+            (dedupe_key, completed_since),
+        ).fetchone()
+
+    def latest_completed(self, dedupe_key: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND status = 'completed' ORDER BY finished_at DESC LIMIT 1",
+                (dedupe_key,),
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A worker that died while stopping a cancelled job leaves nothing to resume
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', error = 'Research was cancelled', finished_at = ? "
+                    "WHERE status = 'running' AND lease_expires < ? AND cancel_requested = 1",
+                    (datetime.now().isoformat(), now),
+                )
+                # Jobs whose worker died without finishing are retried until max_attempts is spent
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Worker lease expired too many times', finished_at = ? "
+                    "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                    (datetime.now().isoformat(), now, self.max_attempts),
+                )
+                # Priority (raised by waiting time) first, then fair share: the client with the fewest
+                # running jobs goes next, so one bulk submitter cannot occupy every slot
+                aging = f" + (julianday(:now_iso) - julianday(created_at)) * 86400.0 / {self.priority_aging:g}" \
+                    if self.priority_aging > 0 else ""
+                row = self._conn.execute(
+                    "SELECT * FROM jobs AS j WHERE status = 'queued' OR (status = 'running' AND lease_expires < :now) "
+                    f"ORDER BY CAST(priority{aging} AS INTEGER) DESC, "
+                    "(SELECT COUNT(*) FROM jobs AS r WHERE r.status = 'running' AND r.lease_expires >= :now "
+                    "AND r.client_id IS j.client_id) ASC, "
+                    "created_at LIMIT 1",
+                    {"now": now, "now_iso": datetime.now().isoformat()},
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                started_at = datetime.now().isoformat()
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_id = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "started_at = ? WHERE research_id = ?",
+                    (worker_id, now + lease_seconds, started_at, row["research_id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = self._row_to_job(row)
+        job.status = "running"
+        job.worker_id = worker_id
+        job.lease_expires = now + lease_seconds
+        job.attempts += 1
+        job.started_at = started_at
+        return job
+
+    @staticmethod
+    def _claim_filter(worker_id: Optional[str], attempt: Optional[int]) -> Tuple[str, list]:
+        """WHERE clause limiting a write to the job as claimed by this worker, if one is given"""
+        if worker_id is None:
+            return "", []
+        clause, params = " AND worker_id = ? AND status = 'running'", [worker_id]
+        if attempt is not None:
+            # The same worker may claim its own expired job again; the attempt tells the two claims apart
+            clause += " AND attempts = ?"
+            params.append(attempt)
+        return clause, params
+
+    def heartbeat(
+        self,
+        research_id: str,
+        worker_id: str,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        attempt: Optional[int] = None
+    ) -> bool:
+        clause, params = self._claim_filter(worker_id, attempt)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE research_id = ?{clause}",
+                (time.time() + lease_seconds, research_id, *params),
+            )
+        return cursor.rowcount == 1
+
+    def update(self, research_id: str, worker_id: Optional[str] = None, attempt: Optional[int] = None, **fields) -> bool:
+        unknown = set(fields) - set(self._UPDATABLE)
+        if unknown:
+            raise ValueError(f"Cannot update job fields: {sorted(unknown)}")
+        if not fields:
+            return True
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        values = [json.dumps(value) if name in self._JSON_FIELDS else value for name, value in fields.items()]
+        clause, params = self._claim_filter(worker_id, attempt)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE research_id = ?{clause}",
+                (*values, research_id, *params),
+            )
+        return cursor.rowcount == 1
+
+    def complete(
+        self,
+        research_id: str,
+        result_path: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        attempt: Optional[int] = None
+    ) -> bool:
+        return self.update(
+            research_id,
+            worker_id=worker_id,
+            attempt=attempt,
+            status="completed",
+            progress=100,
+            result_path=result_path,
+            finished_at=datetime.now().isoformat(),
+        )
+
+    def fail(
+        self,
+        research_id: str,
+        error: str,
+        status: str = "failed",
+        worker_id: Optional[str] = None,
+        attempt: Optional[int] = None
+    ) -> bool:
+        return self.update(
+            research_id, worker_id=worker_id, attempt=attempt,
+            status=status, error=error, finished_at=datetime.now().isoformat()
+        )
+
+    def cancel(self, research_id: str) -> Optional[str]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT status FROM jobs WHERE research_id = ?", (research_id,)).fetchone()
+                status = row["status"] if row else None
+                if status == "queued":
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'cancelled', error = 'Research was cancelled', finished_at = ? "
+                        "WHERE research_id = ?",
+                        (datetime.now().isoformat(), research_id),
+                    )
+                    status = "cancelled"
+                elif status == "running":
+                    self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE research_id = ?", (research_id,))
+                    status = "cancelling"
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return status
+
+    def is_cancel_requested(self, research_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE research_id = ?", (research_id,)
+            ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def requeue(self, research_id: str) -> bool:
+        placeholders = ", ".join("?" for _ in RESUMABLE_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, cancel_requested = 0, worker_id = NULL, "
+                "lease_expires = NULL, error = NULL, started_at = NULL, finished_at = NULL "
+                f"WHERE research_id = ? AND status IN ({placeholders})",
+                (research_id, *RESUMABLE_STATUSES),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, research_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE research_id = ?", (research_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in ("queued", "running") + TERMINAL_STATUSES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# --- Backend Registry ---
+_BACKENDS: Dict[str, Type[JobQueue]] = {
+    "sqlite": SQLiteJobQueue,
+}
+
+
+def register_job_queue_backend(name: str, backend: Type[JobQueue]) -> None:
+    _BACKENDS[name] = backend
+
+
+def create_job_queue(backend: str = JOB_QUEUE_BACKEND, **kwargs) -> JobQueue:
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown job queue backend: {backend!r} (available: {sorted(_BACKENDS)})")
+    return _BACKENDS[backend](**kwargs)
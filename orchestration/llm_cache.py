@@ -0,0 +1,79 @@
+"""
+Module: LLM Response Cache
+Focus: Content-Addressed Completion Reuse and Offline Replay for Agent LLMs
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Optional
+
+from orchestration.disk_cache import DiskCache
+
+# --- Configuration & Environment Management ---
+# "off": no caching (default) | "readwrite": serve hits, store misses | "replay": serve hits only, never call the model
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "off")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("data", "llm_cache.db"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 20000))
+
+LLM_CACHE_MODES = ("off", "readwrite", "replay")
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a prompt has no recorded completion"""
+
+
+class LLMCache:
+    """
+    Completion store keyed on model, temperature, stop words, tool schemas and the full message list
+    Entries never expire: the same key always means the same request
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self._store = DiskCache(path, max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "replay_misses": 0}
+
+    @staticmethod
+    def make_key(model: str, temperature: Optional[float], messages: Any, **params: Any) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        material = json.dumps(
+            {"model": model, "temperature": temperature, "messages": messages, **params},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        return self._store.get(key)
+
+    def set(self, key: str, completion: str, model: str) -> None:
+        self._store.set(key, completion, label=model)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update(entries=self._store.count(), evictions=self._store.evictions)
+        return counters
+
+    def close(self) -> None:
+        self._store.close()
+
+
+# --- Shared Instance ---
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
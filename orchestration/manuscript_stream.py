@@ -0,0 +1,202 @@
+"""
+Module: Live Manuscript Streaming
+Focus: Append-Only Chunk Logs with Resumable Byte Offsets for Agent Output as It Is Generated
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- Configuration & Environment Management ---
+# One JSON-lines log per run; readers resume from any byte offset they have already consumed.
+STREAM_DIR = os.getenv("MANUSCRIPT_STREAM_DIR", os.path.join("data", "streams"))
+# Tokens are coalesced into records of roughly this many characters, or whatever arrived in this many seconds
+STREAM_FLUSH_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", 256))
+STREAM_FLUSH_SECONDS = float(os.getenv("STREAM_FLUSH_SECONDS", 0.25))
+# Upper bound on what one reader pulls per batch, so slow clients never make the server buffer a whole log
+STREAM_BATCH_BYTES = int(os.getenv("STREAM_BATCH_BYTES", 64 * 1024))
+# How often readers check the log for new records; works across processes because the log is a plain file
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", 0.2))
+
+
+def stream_path(research_id: str, stream_dir: str = STREAM_DIR) -> str:
+    return os.path.join(stream_dir, f"{research_id}.jsonl")
+
+
+class StreamWriter:
+    """
+    Appends one run's chunks as JSON lines
+    Record types: "call" (an LLM call started; drafts restart), "chunk" (text), "task" (task finished), "end"
+    """
+
+    def __init__(self, research_id: str, stream_dir: str = STREAM_DIR):
+        os.makedirs(stream_dir, exist_ok=True)
+        self.research_id = research_id
+        self._lock = threading.Lock()
+        # Retries of the same job start a fresh log so offsets never point into a stale attempt
+        self._file = open(stream_path(research_id, stream_dir), "w", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+        self._current: Optional[Tuple[str, str]] = None
+        self._calls = 0
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+
+    def _flush_buffer(self) -> None:
+        if self._buffer and self._current is not None:
+            self._write({"type": "chunk", "task": self._current[0], "call": self._calls, "text": "".join(self._buffer)})
+            self._buffer.clear()
+            self._buffered_chars = 0
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def chunk(self, task_key: str, call_id: str, text: str) -> None:
+        with self._lock:
+            if self._current != (task_key, call_id):
+                self._flush_buffer()
+                self._current = (task_key, call_id)
+                self._calls += 1
+                self._write({"type": "call", "task": task_key, "call": self._calls})
+            self._buffer.append(text)
+            self._buffered_chars += len(text)
+            if self._buffered_chars >= STREAM_FLUSH_CHARS or time.monotonic() - self._last_flush >= STREAM_FLUSH_SECONDS:
+                self._flush_buffer()
+
+    def task_complete(self, task_key: str) -> None:
+        with self._lock:
+            self._flush_buffer()
+            self._current = None
+            self._write({"type": "task", "task": task_key})
+            self._file.flush()
+
+    def close(self, status: str) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_buffer()
+            self._write({"type": "end", "status": status})
+            self._file.close()
+
+    def discard(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_stream(
+    research_id: str,
+    offset: int = 0,
+    max_bytes: int = STREAM_BATCH_BYTES,
+    stream_dir: str = STREAM_DIR
+) -> Tuple[List[dict], int]:
+    """
+    Complete records starting at `offset`, and the offset to resume from
+    A partially written trailing line is left for the next read
+    """
+    try:
+        with open(stream_path(research_id, stream_dir), "rb") as f:
+            f.seek(offset)
+            data = f.read(max_bytes)
+    except FileNotFoundError:
+        return [], offset
+
+    end = data.rfind(b"\n")
+    if end < 0:
+        # A single record larger than the batch: widen the window instead of stalling the reader
+        if len(data) == max_bytes:
+            return read_stream(research_id, offset, max_bytes * 2, stream_dir)
+        return [], offset
+    records = []
+    for line in data[:end].split(b"\n"):
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # A corrupt record is skipped; the offsets around it stay valid
+            continue
+    return records, offset + end + 1
+
+
+def is_record_boundary(research_id: str, offset: int, stream_dir: str = STREAM_DIR) -> bool:
+    """Whether a client-supplied resume offset is the start of the log or falls right after a complete record"""
+    if offset == 0:
+        return True
+    if offset < 0:
+        return False
+    try:
+        with open(stream_path(research_id, stream_dir), "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+    except FileNotFoundError:
+        return False
+
+
+# --- CrewAI Event Routing ---
+# CrewAI emits every streamed token on one process-wide event bus, tagged with the task that asked for it.
+# Runs register their task ids here; the single listener forwards each chunk to the owning run's writer.
+_routes: Dict[str, Tuple[StreamWriter, str]] = {}
+_routes_lock = threading.Lock()
+_listener_installed = False
+
+
+def _on_stream_chunk(source: Any, event: Any) -> None:
+    if event.tool_call is not None or not event.chunk:
+        return
+    with _routes_lock:
+        route = _routes.get(event.task_id)
+    if route is not None:
+        writer, task_key = route
+        writer.chunk(task_key, event.call_id, event.chunk)
+
+
+def install_stream_listener() -> None:
+    """Subscribe to CrewAI stream chunk events once per process"""
+    global _listener_installed
+    with _routes_lock:
+        if _listener_installed:
+            return
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+        crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+        _listener_installed = True
+
+
+class ManuscriptStream:
+    """
+    Streams one run's agent output to its chunk log
+    Bind tasks with bind(task_key, task) before kickoff and always close() afterwards
+    """
+
+    def __init__(self, research_id: str, stream_dir: str = STREAM_DIR):
+        install_stream_listener()
+        self.writer = StreamWriter(research_id, stream_dir)
+        self._task_ids: List[str] = []
+
+    def bind(self, task_key: str, task: Any) -> None:
+        task_id = str(task.id)
+        with _routes_lock:
+            _routes[task_id] = (self.writer, task_key)
+        self._task_ids.append(task_id)
+
+    def task_complete(self, task_key: str) -> None:
+        self.writer.task_complete(task_key)
+
+    def _unbind(self) -> None:
+        with _routes_lock:
+            for task_id in self._task_ids:
+                _routes.pop(task_id, None)
+
+    def close(self, status: str) -> None:
+        self._unbind()
+        self.writer.close(status)
+
+    def discard(self) -> None:
+        """Stop writing without an end record, e.g. when another worker has taken over the run and its log"""
+        self._unbind()
+        self.writer.discard()
@@ -0,0 +1,211 @@
+"""
+Module: Orchestration Metrics
+Focus: Prometheus Text-Format Counters, Gauges and Histograms for Runs, LLM Calls and Search
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; runs take minutes, single LLM and search calls take well under a minute
+RUN_BUCKETS = (10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+TASK_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200)
+CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        ...
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = CALL_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Per label set: one count per bucket, then the sum and the count of observations
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in values:
+            cumulative = 0.0
+            for index, bound in enumerate(self.buckets):
+                cumulative += state[index]
+                bucket = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket} {_format_value(cumulative)}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics)
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Orchestration ---
+RUN_DURATION = REGISTRY.register(Histogram(
+    "research_run_duration_seconds", "End-to-end research run duration", ("status",), RUN_BUCKETS
+))
+TASK_DURATION = REGISTRY.register(Histogram(
+    "research_task_duration_seconds", "Duration of each crew stage", ("task",), TASK_BUCKETS
+))
+JOBS = REGISTRY.register(Gauge("research_jobs", "Jobs in the durable queue by status", ("status",)))
+WORKER_SLOTS = REGISTRY.register(Gauge(
+    "research_worker_pool_jobs", "Jobs held by this process's worker pool", ("state",)
+))
+WEBSOCKETS_OPEN = REGISTRY.register(Gauge("research_websocket_connections", "Open progress WebSocket connections"))
+
+# --- LLM & Tools ---
+LLM_LATENCY = REGISTRY.register(Histogram("llm_call_duration_seconds", "LLM call latency", ("model",)))
+LLM_TOKENS = REGISTRY.register(Counter("llm_tokens_total", "LLM tokens by model and direction", ("model", "kind")))
+LLM_ERRORS = REGISTRY.register(Counter("llm_call_errors_total", "Failed LLM calls", ("model",)))
+SEARCH_LATENCY = REGISTRY.register(Histogram("serper_request_duration_seconds", "Serper API request latency (cache misses only)"))
+SEARCH_ERRORS = REGISTRY.register(Counter("serper_request_errors_total", "Failed Serper API requests"))
+RATE_LIMIT_WAIT = REGISTRY.register(Histogram(
+    "rate_limit_wait_seconds", "Time calls waited for provider rate-limit capacity", ("key",)
+))
+RATE_LIMITED = REGISTRY.register(Counter("rate_limited_total", "Provider 429 responses by rate-limit key", ("key",)))
+
+
+@contextmanager
+def observe_search() -> Iterator[None]:
+    """Time one Serper request and count it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        SEARCH_ERRORS.inc()
+        raise
+    finally:
+        SEARCH_LATENCY.observe(time.perf_counter() - started)
+
+
+def render_metrics(jobs: Optional[Dict[str, int]] = None, workers: Optional[dict] = None) -> str:
+    """Refresh the gauges that are sampled rather than tracked, then render everything"""
+    for status, count in (jobs or {}).items():
+        JOBS.set(count, status=status)
+    if workers:
+        WORKER_SLOTS.set(workers.get("running", 0), state="running")
+        WORKER_SLOTS.set(workers.get("queued", 0), state="queued")
+    return REGISTRY.render()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> threading.Thread:
+    """Serve /metrics from a background thread, for worker processes that have no API of their own"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True)
+    thread.start()
+    return thread
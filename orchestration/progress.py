@@ -0,0 +1,125 @@
+"""
+Module: Crew Progress Tracking
+Focus: Per-Stage Timing, LLM Turns and Tool Calls from CrewAI Callbacks
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# --- Pipeline Stages ---
+# (task key, agent label shown in the UI, progress % when the stage starts, progress % when it ends)
+STAGES = (
+    ("research_task", "Research Specialist", 10, 40),
+    ("analysis_task", "Data Analyst", 40, 70),
+    ("writing_task", "Technical Writer", 70, 95),
+)
+
+
+class ProgressTracker:
+    """
+    Records which task is running and how much work each stage has done
+    Agents get a stage-bound step callback and tasks a stage-bound completion callback;
+    every change is forwarded as session fields through `report(**fields)`
+    """
+
+    def __init__(self, report: Callable[..., None]):
+        self.report = report
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        self._stage_started: Dict[str, float] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {
+            key: {"status": "pending", "agent": agent, "llm_turns": 0, "tool_calls": 0, "elapsed_seconds": 0.0}
+            for key, agent, _, _ in STAGES
+        }
+
+    def _stage_bounds(self, key: str):
+        for stage_key, agent, start, end in STAGES:
+            if stage_key == key:
+                return agent, start, end
+        raise KeyError(key)
+
+    def _progress(self, key: str) -> int:
+        _, start, end = self._stage_bounds(key)
+        stage = self.stages[key]
+        if stage["status"] == "completed":
+            return end
+        # Each LLM turn inches the bar forward without ever reaching the next stage's floor
+        steps = stage["llm_turns"] + stage["tool_calls"]
+        return start + min(steps * 2, end - start - 1)
+
+    def _snapshot(self, key: str) -> dict:
+        now = time.monotonic()
+        for stage_key, stage in self.stages.items():
+            if stage["status"] == "running":
+                stage["elapsed_seconds"] = round(now - self._stage_started[stage_key], 2)
+        return {
+            "progress": self._progress(key),
+            "current_task": key,
+            "current_agent": self.stages[key]["agent"],
+            "elapsed_seconds": round(now - self._started, 2) if self._started else 0.0,
+            "stages": {stage_key: dict(stage) for stage_key, stage in self.stages.items()},
+        }
+
+    def _begin(self, key: str) -> None:
+        stage = self.stages[key]
+        if stage["status"] == "pending":
+            stage["status"] = "running"
+            self._stage_started[key] = time.monotonic()
+
+    def start(self, key: str = STAGES[0][0]) -> None:
+        with self._lock:
+            self._started = time.monotonic()
+            self._begin(key)
+            fields = self._snapshot(key)
+        self.report(**fields)
+
+    def skip(self, keys: Sequence[str]) -> None:
+        """Mark stages restored from a checkpoint as completed without running them"""
+        with self._lock:
+            for key in keys:
+                self.stages[key]["status"] = "completed"
+
+    def step_callback(self, key: str) -> Callable[[Any], None]:
+        def on_step(step: Any) -> None:
+            with self._lock:
+                self._begin(key)
+                stage = self.stages[key]
+                # AgentAction carries the tool it invoked; AgentFinish is a plain LLM answer.
+                # ToolResult is reported separately right before its AgentAction, so it is not counted twice.
+                if hasattr(step, "tool"):
+                    stage["llm_turns"] += 1
+                    stage["tool_calls"] += 1
+                elif hasattr(step, "output"):
+                    stage["llm_turns"] += 1
+                else:
+                    return
+                fields = self._snapshot(key)
+            self.report(**fields)
+        return on_step
+
+    def record_context(self, key: str, stats: dict) -> None:
+        """Attach the token counts of the context handed to a stage"""
+        with self._lock:
+            self.stages[key]["context"] = dict(stats)
+            fields = {"stages": {stage_key: dict(stage) for stage_key, stage in self.stages.items()}}
+        self.report(**fields)
+
+    def task_callback(self, key: str) -> Callable[[Any], None]:
+        def on_task_complete(output: Any) -> None:
+            with self._lock:
+                self._begin(key)
+                stage = self.stages[key]
+                stage["status"] = "completed"
+                stage["elapsed_seconds"] = round(time.monotonic() - self._stage_started[key], 2)
+
+                # Sequential process: the next pending stage starts as soon as this one finishes
+                current = key
+                for stage_key, _, _, _ in STAGES:
+                    if self.stages[stage_key]["status"] == "pending":
+                        self._begin(stage_key)
+                        current = stage_key
+                        break
+                fields = self._snapshot(current)
+            self.report(**fields)
+        return on_task_complete
@@ -0,0 +1,353 @@
+"""
+Module: Provider Rate Limiting
+Focus: Shared Token Buckets per Provider and Model with Adaptive Backoff on 429 Responses
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from orchestration.metrics import RATE_LIMIT_WAIT, RATE_LIMITED
+
+# --- Configuration & Environment Management ---
+# Requests and tokens per minute by model or provider, e.g. {"groq": {"rpm": 30, "tpm": 6000}, "serper": {"rpm": 300}}.
+# A model name takes precedence over its provider; keys without a limit still share 429 backoff.
+RATE_LIMITS: Dict[str, dict] = json.loads(os.getenv("RATE_LIMITS") or "{}")
+# "sqlite" shares buckets between the API and every worker process on the host; "memory" is per process
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite")
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH", os.path.join("data", "rate_limits.db"))
+# Rate-limited calls are retried this many times before the error reaches the agent
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", 5))
+# Tokens reserved for a completion before its real size is known
+RATE_LIMIT_COMPLETION_TOKENS = int(os.getenv("RATE_LIMIT_COMPLETION_TOKENS", 1000))
+
+# A 429 halves the effective rate; every successful call wins back a little of it
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.05
+MIN_RATE_FACTOR = 0.1
+MAX_BACKOFF_SECONDS = 60.0
+# Waiting callers re-check at least this often, so limits freed by other processes are picked up quickly
+MAX_SLEEP_SECONDS = 5.0
+# How far down an exception's __cause__/__context__ chain a wrapped 429 is looked for
+MAX_CAUSE_DEPTH = 5
+
+T = TypeVar("T")
+
+
+def rate_limit_key(model: str) -> str:
+    """The configured name governing a model: the model itself, else its provider prefix ("groq/llama-3" -> "groq")"""
+    provider = model.split("/", 1)[0] if "/" in model else "openai"
+    if model in RATE_LIMITS or provider not in RATE_LIMITS:
+        return model
+    return provider
+
+
+def rate_limit_error(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    Whether an exception is a provider rate limit, and the server's Retry-After in seconds if it sent one
+    Recognizes litellm/OpenAI RateLimitError and HTTP errors carrying a 429 response, also when wrapped in
+    another exception (CrewAI's streaming path re-raises them as a plain Exception)
+    """
+    seen = 0
+    while error is not None and seen < MAX_CAUSE_DEPTH:
+        response = getattr(error, "response", None)
+        status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+        if status == 429 or type(error).__name__ == "RateLimitError":
+            return True, _retry_after(response)
+        error = error.__cause__ or error.__context__
+        seen += 1
+    return False, None
+
+
+def _retry_after(response: Any) -> Optional[float]:
+
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+@dataclass
+class Bucket:
+    requests: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    rate_factor: float = 1.0
+    strikes: int = 0
+
+
+class RateLimiter(ABC):
+    """
+    Token buckets keyed by provider or model
+    Each bucket refills at the configured RPM and TPM, scaled down after 429s; the backends only differ
+    in where buckets live, and every change to a bucket runs atomically through `_transact`
+    """
+
+    def __init__(self, limits: Optional[Dict[str, dict]] = None):
+        self.limits = RATE_LIMITS if limits is None else limits
+
+    @abstractmethod
+    def _transact(self, key: str, change: Callable[[Bucket, float], T]) -> T:
+        """Apply `change(bucket, now)` to the stored bucket (created full if missing) and persist it"""
+        ...
+
+    @abstractmethod
+    def _peek(self, key: str) -> Optional[Bucket]:
+        """The stored bucket without locking it for writing; None if the key has none yet"""
+        ...
+
+    def _is_limited(self, key: str) -> bool:
+        limit = self.limits.get(key, {})
+        return bool(limit.get("rpm") or limit.get("tpm"))
+
+    def _new_bucket(self, key: str, now: float) -> Bucket:
+        limit = self.limits.get(key, {})
+        return Bucket(requests=float(limit.get("rpm", 0)), tokens=float(limit.get("tpm", 0)), updated=now)
+
+    def _reserve(self, key: str, tokens: int) -> float:
+        """Take one request and `tokens` tokens if available; otherwise the seconds to wait before asking again"""
+        limit = self.limits.get(key, {})
+        rpm, tpm = float(limit.get("rpm", 0)), float(limit.get("tpm", 0))
+
+        def take(bucket: Bucket, now: float) -> float:
+            elapsed = max(0.0, now - bucket.updated)
+            bucket.updated = now
+            waits = [bucket.blocked_until - now]
+            if rpm:
+                capacity = max(1.0, rpm * bucket.rate_factor)
+                bucket.requests = min(capacity, bucket.requests + elapsed * capacity / 60)
+                waits.append((1 - bucket.requests) * 60 / capacity)
+            if tpm:
+                capacity = max(1.0, tpm * bucket.rate_factor)
+                bucket.tokens = min(capacity, bucket.tokens + elapsed * capacity / 60)
+                # A request larger than the whole bucket only waits for a full one
+                waits.append((min(tokens, capacity) - bucket.tokens) * 60 / capacity)
+            wait = max(waits)
+            if wait > 0:
+                return wait
+            if rpm:
+                bucket.requests -= 1
+            if tpm:
+                bucket.tokens -= tokens
+            return 0.0
+
+        return self._transact(key, take)
+
+    def acquire(self, key: str, tokens: int = 0) -> float:
+        """Block until the key has capacity for one request of `tokens` tokens; returns the seconds waited"""
+        # Keys without a configured limit only honour a 429 backoff, which a read is enough to see
+        reserve = self._reserve if self._is_limited(key) else self._blocked_for
+        started = time.monotonic()
+        wait = reserve(key, tokens)
+        if wait <= 0:
+            return 0.0
+        while wait > 0:
+            time.sleep(min(wait, MAX_SLEEP_SECONDS))
+            wait = reserve(key, tokens)
+        waited = time.monotonic() - started
+        RATE_LIMIT_WAIT.observe(waited, key=key)
+        return waited
+
+    def _blocked_for(self, key: str, tokens: int = 0) -> float:
+        bucket = self._peek(key)
+        return bucket.blocked_until - time.time() if bucket is not None else 0.0
+
+    def record_success(self, key: str, reserved: int = 0, used: int = 0) -> None:
+        """Win back some of the rate lost to 429s, and correct the token reservation with the real usage"""
+        if not self._is_limited(key):
+            # Nothing to refund; only reset the backoff if a 429 left one behind
+            bucket = self._peek(key)
+            if bucket is None or bucket.strikes == 0:
+                return
+        refund = reserved - used if self.limits.get(key, {}).get("tpm") else 0
+
+        def recover(bucket: Bucket, now: float) -> None:
+            bucket.strikes = 0
+            bucket.rate_factor = min(1.0, bucket.rate_factor + RECOVERY_STEP)
+            bucket.tokens += refund
+
+        self._transact(key, recover)
+
+    def record_rate_limited(self, key: str, retry_after: Optional[float] = None) -> float:
+        """Pause every caller of the key and lower its rate; returns the pause in seconds"""
+        RATE_LIMITED.inc(key=key)
+
+        def back_off(bucket: Bucket, now: float) -> float:
+            bucket.strikes += 1
+            bucket.rate_factor = max(MIN_RATE_FACTOR, bucket.rate_factor * BACKOFF_FACTOR)
+            delay = retry_after if retry_after is not None else min(MAX_BACKOFF_SECONDS, 2.0 ** bucket.strikes)
+            delay *= random.uniform(1.0, 1.2)
+            bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            bucket.requests = min(bucket.requests, 0.0)
+            return delay
+
+        return self._transact(key, back_off)
+
+    def call(
+        self,
+        key: str,
+        fn: Callable[[], T],
+        tokens: int = 0,
+        used_tokens: Optional[Callable[[T], int]] = None,
+        max_retries: int = RATE_LIMIT_MAX_RETRIES
+    ) -> T:
+        """Run `fn` within the key's limits, retrying it after a shared backoff whenever the provider answers 429"""
+        attempt = 0
+        while True:
+            self.acquire(key, tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                limited, retry_after = rate_limit_error(e)
+                if not limited or attempt >= max_retries:
+                    raise
+                attempt += 1
+                delay = self.record_rate_limited(key, retry_after)
+                print(f"Rate limited by {key}; backing off {delay:.1f}s (retry {attempt}/{max_retries})")
+                continue
+            self.record_success(key, tokens, used_tokens(result) if used_tokens is not None else tokens)
+            return result
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Buckets shared by every thread of this process"""
+
+    def __init__(self, limits: Optional[Dict[str, dict]] = None):
+        super().__init__(limits)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Bucket] = {}
+
+    def _transact(self, key: str, change: Callable[[Bucket, float], T]) -> T:
+        now = time.time()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = self._new_bucket(key, now)
+            return change(bucket, now)
+
+    def _peek(self, key: str) -> Optional[Bucket]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return Bucket(**asdict(bucket)) if bucket is not None else None
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Buckets in a SQLite file shared by the API and all worker processes on the host
+    Every bucket change runs inside BEGIN IMMEDIATE, so processes never hand out the same capacity twice
+    """
+
+    def __init__(self, path: str = RATE_LIMIT_PATH, limits: Optional[Dict[str, dict]] = None):
+        super().__init__(limits)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                key           TEXT PRIMARY KEY,
+                requests      REAL NOT NULL,
+                tokens        REAL NOT NULL,
+                updated       REAL NOT NULL,
+                blocked_until REAL NOT NULL DEFAULT 0,
+                rate_factor   REAL NOT NULL DEFAULT 1,
+                strikes       INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+    def _transact(self, key: str, change: Callable[[Bucket, float], T]) -> T:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute("SELECT * FROM buckets WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    bucket = self._new_bucket(key, now)
+                else:
+                    bucket = Bucket(**{name: row[name] for name in Bucket.__dataclass_fields__})
+                result = change(bucket, now)
+                state = asdict(bucket)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, requests, tokens, updated, blocked_until, rate_factor, strikes) "
+                    "VALUES (:key, :requests, :tokens, :updated, :blocked_until, :rate_factor, :strikes)",
+                    {"key": key, **state},
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def _peek(self, key: str) -> Optional[Bucket]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM buckets WHERE key = ?", (key,)).fetchone()
+        return Bucket(**{name: row[name] for name in Bucket.__dataclass_fields__}) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# --- Backend Registry ---
+_BACKENDS: Dict[str, Type[RateLimiter]] = {
+    "memory": MemoryRateLimiter,
+    "sqlite": SQLiteRateLimiter,
+}
+
+
+def register_rate_limiter_backend(name: str, backend: Type[RateLimiter]) -> None:
+    _BACKENDS[name] = backend
+
+
+def create_rate_limiter(backend: str = RATE_LIMIT_BACKEND, **kwargs) -> RateLimiter:
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown rate limiter backend: {backend!r} (available: {sorted(_BACKENDS)})")
+    return _BACKENDS[backend](**kwargs)
+
+
+# --- Shared Instance ---
+# One limiter per process; with the SQLite backend it also coordinates with every other process.
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = create_rate_limiter()
+        return _rate_limiter
+
+
+def prompt_tokens(messages: Any) -> int:
+    from orchestration.context_compaction import count_tokens
+
+    if isinstance(messages, str):
+        return count_tokens(messages)
+    return count_tokens("\n".join(str(message.get("content") or "") for message in messages))
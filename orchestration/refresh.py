@@ -0,0 +1,69 @@
+"""
+Module: Incremental Refresh
+Focus: Revising a Prior Run's Report with Only the Material Published Since
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from orchestration.context_compaction import extract_references
+from tasks.analysis_task import ANALYSIS_OUTPUT_FILE
+from tasks.research_task import RESEARCH_OUTPUT_FILE
+from tasks.writing_task import WRITING_OUTPUT_FILE
+
+# --- Configuration & Environment Management ---
+# How many already-cited sources the refresh research prompt lists; all of them are filtered out of searches
+REFRESH_PROMPT_SOURCES = int(os.getenv("REFRESH_PROMPT_SOURCES", 40))
+
+
+@dataclass
+class RefreshBaseline:
+    """Outputs of the run being refreshed; `since` is when that run searched"""
+    research_id: str
+    since: datetime
+    findings: str
+    analysis: str
+    report: str
+    sources: List[str]
+
+    @property
+    def since_label(self) -> str:
+        return self.since.strftime("%Y-%m-%d")
+
+    def prompt_sources(self) -> List[str]:
+        # Braces would be read as CrewAI input placeholders
+        return [url for url in self.sources if "{" not in url and "}" not in url][:REFRESH_PROMPT_SOURCES]
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def load_baseline(research_id: str, run_dir: str, since: str) -> Optional[RefreshBaseline]:
+    """
+    The prior run's findings, analysis, report and cited sources; None if its findings or report are gone
+    `since` is the ISO timestamp the prior run started at
+    """
+    findings = _read(os.path.join(run_dir, RESEARCH_OUTPUT_FILE))
+    report = _read(os.path.join(run_dir, WRITING_OUTPUT_FILE))
+    if not findings or not report:
+        return None
+    return RefreshBaseline(
+        research_id=research_id,
+        since=datetime.fromisoformat(since),
+        findings=findings,
+        analysis=_read(os.path.join(run_dir, ANALYSIS_OUTPUT_FILE)) or "",
+        report=report,
+        sources=extract_references(findings + "\n" + report),
+    )
+
+
+def merge_updates(findings: str, updates: str, since_label: str) -> str:
+    """Cumulative findings: the prior document with this refresh's new material appended, so the next refresh sees both"""
+    return f"{findings.rstrip()}\n\n## Updates since {since_label}\n\n{updates.strip()}\n"
@@ -0,0 +1,174 @@
+"""
+Module: Run Control
+Focus: Cancellation and Deadlines Enforced at Agent Step Boundaries
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# --- Configuration & Environment Management ---
+# Wall-clock limits in seconds; 0 means no limit. A run that overruns is stopped at its next step boundary.
+RUN_DEADLINE_SECONDS = float(os.getenv("RUN_DEADLINE_SECONDS", 0))
+TASK_DEADLINES = {
+    "research_task": float(os.getenv("RESEARCH_TASK_DEADLINE_SECONDS", 0)),
+    "analysis_task": float(os.getenv("ANALYSIS_TASK_DEADLINE_SECONDS", 0)),
+    "writing_task": float(os.getenv("WRITING_TASK_DEADLINE_SECONDS", 0)),
+}
+# How often a run asks the shared job queue whether it was cancelled from another process
+CANCEL_POLL_SECONDS = float(os.getenv("CANCEL_POLL_SECONDS", 2))
+
+
+class RunStopped(Exception):
+    """Raised when a run ends early on purpose; `status` is "cancelled" or "timed_out" """
+
+    def __init__(self, status: str, reason: str):
+        super().__init__(reason)
+        self.status = status
+
+
+class RunControl:
+    """
+    Stop switch for one run
+    check() is called before every LLM call and after every agent step and task; once the run is
+    cancelled or past a deadline it raises, and keeps raising for every sibling task still running
+    """
+
+    def __init__(
+        self,
+        research_id: str,
+        is_cancel_requested: Optional[Callable[[], bool]] = None,
+        run_deadline: float = RUN_DEADLINE_SECONDS,
+        task_deadlines: Optional[Dict[str, float]] = None
+    ):
+        install_llm_call_guard()
+        self.research_id = research_id
+        self.is_cancel_requested = is_cancel_requested
+        self.run_deadline = run_deadline
+        self.task_deadlines = TASK_DEADLINES if task_deadlines is None else task_deadlines
+        self.started = time.monotonic()
+        self.stopped: Optional[RunStopped] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._task_started: Dict[str, float] = {}
+        self._last_poll = 0.0
+        self._task_ids = []
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _cancel_requested(self) -> bool:
+        if self._cancel.is_set():
+            return True
+        if self.is_cancel_requested is None:
+            return False
+        now = time.monotonic()
+        if now - self._last_poll < CANCEL_POLL_SECONDS:
+            return False
+        self._last_poll = now
+        if self.is_cancel_requested():
+            self._cancel.set()
+            return True
+        return False
+
+    def _stop_reason(self, task_key: Optional[str]) -> Optional[RunStopped]:
+        now = time.monotonic()
+        if self._cancel_requested():
+            return RunStopped("cancelled", "Research was cancelled")
+        if self.run_deadline and now - self.started > self.run_deadline:
+            return RunStopped("timed_out", f"Research exceeded its {self.run_deadline:g}s deadline")
+        if task_key is not None:
+            started = self._task_started.setdefault(task_key, now)
+            limit = self.task_deadlines.get(task_key, 0)
+            if limit and now - started > limit:
+                return RunStopped("timed_out", f"{task_key} exceeded its {limit:g}s deadline")
+        return None
+
+    def check(self, task_key: Optional[str] = None) -> None:
+        with self._lock:
+            if self.stopped is None:
+                self.stopped = self._stop_reason(task_key)
+            stopped = self.stopped
+        if stopped is not None:
+            # CrewAI retries a failed task unless the error is a deliberate abort
+            from crewai.hooks import HookAborted
+
+            raise HookAborted(str(stopped), source="run_control")
+
+    def step_callback(self, task_key: str) -> Callable[[Any], None]:
+        def on_step(step: Any) -> None:
+            self.check(task_key)
+        return on_step
+
+    def task_callback(self, task_key: str) -> Callable[[Any], None]:
+        def on_task_complete(output: Any) -> None:
+            self.check()
+        return on_task_complete
+
+    def bind(self, task_key: str, task: Any) -> None:
+        """Guard every LLM call the task makes"""
+        task_id = str(task.id)
+        with _routes_lock:
+            _routes[task_id] = (self, task_key)
+        self._task_ids.append(task_id)
+
+    def close(self) -> None:
+        with _routes_lock:
+            for task_id in self._task_ids:
+                _routes.pop(task_id, None)
+        with _active_lock:
+            if _active.get(self.research_id) is self:
+                del _active[self.research_id]
+
+
+# --- In-Process Registry ---
+# Runs executing in this process, so an API cancel reaches them without waiting for the queue poll
+_active: Dict[str, RunControl] = {}
+_active_lock = threading.Lock()
+
+
+def register_run(control: RunControl) -> RunControl:
+    with _active_lock:
+        _active[control.research_id] = control
+    return control
+
+
+def cancel_local_run(research_id: str) -> bool:
+    with _active_lock:
+        control = _active.get(research_id)
+    if control is None:
+        return False
+    control.cancel()
+    return True
+
+
+# --- CrewAI LLM Call Guard ---
+# A single global before-LLM-call hook checks the run that owns the calling task, so a cancelled run
+# spends no more tokens even while an agent is between steps
+_routes: Dict[str, Tuple[RunControl, str]] = {}
+_routes_lock = threading.Lock()
+_guard_installed = False
+
+
+def _guard_llm_call(context: Any) -> None:
+    task = getattr(context, "task", None)
+    if task is None:
+        return None
+    with _routes_lock:
+        route = _routes.get(str(task.id))
+    if route is not None:
+        control, task_key = route
+        control.check(task_key)
+    return None
+
+
+def install_llm_call_guard() -> None:
+    global _guard_installed
+    with _routes_lock:
+        if _guard_installed:
+            return
+        from crewai.hooks import register_before_llm_call_hook
+
+        register_before_llm_call_hook(_guard_llm_call)
+        _guard_installed = True
@@ -0,0 +1,226 @@
+"""
+Module: Run Timing Trace
+Focus: Per-Run Spans for Stages, LLM Calls and Tool Calls, Fed from the CrewAI Event Bus
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from orchestration.metrics import LLM_ERRORS, LLM_LATENCY, LLM_TOKENS
+
+# --- Configuration & Environment Management ---
+# One JSON document per run, written when the run ends
+RUN_TRACE_DIR = os.getenv("RUN_TRACE_DIR", os.path.join("data", "traces"))
+# A call half whose other half never arrives (aborted run, provider error before the event) is dropped
+# after this long, and the oldest are dropped beyond this many, so long-lived processes never accumulate them
+PENDING_CALL_TTL_SECONDS = float(os.getenv("PENDING_CALL_TTL_SECONDS", 900))
+MAX_PENDING_CALLS = int(os.getenv("MAX_PENDING_CALLS", 10000))
+
+
+def trace_path(research_id: str, trace_dir: str = RUN_TRACE_DIR) -> str:
+    return os.path.join(trace_dir, f"{research_id}.json")
+
+
+def load_trace(research_id: str, trace_dir: str = RUN_TRACE_DIR) -> Optional[dict]:
+    try:
+        with open(trace_path(research_id, trace_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class RunTrace:
+    """
+    Collects timed spans for one run in memory and writes them once at the end
+    Span times are seconds relative to the start of the run
+    """
+
+    def __init__(self, research_id: str, trace_dir: str = RUN_TRACE_DIR):
+        self.research_id = research_id
+        self.trace_dir = trace_dir
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._spans: List[dict] = []
+        self._task_ids: List[str] = []
+        install_instrumentation()
+
+    def add(self, name: str, start: float, end: float, **attrs: Any) -> None:
+        span = {"name": name, "start": round(start - self.started, 4), "duration": round(end - start, 4), **attrs}
+        with self._lock:
+            self._spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[None]:
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.time(), **attrs)
+
+    def bind(self, task_key: str, task: Any) -> None:
+        """Attribute the LLM and tool calls of a crew task to this run"""
+        task_id = str(task.id)
+        with _routes_lock:
+            _routes[task_id] = (self, task_key)
+        self._task_ids.append(task_id)
+
+    def summary(self) -> Dict[str, dict]:
+        """Per-stage totals of LLM and tool time, so the slowest part of a stage is visible at a glance"""
+        totals: Dict[str, dict] = {}
+        with self._lock:
+            spans = list(self._spans)
+        for span in spans:
+            task = span.get("task")
+            if not task or span["name"] not in ("llm_call", "tool_call"):
+                continue
+            stage = totals.setdefault(
+                task, {"llm_calls": 0, "llm_seconds": 0.0, "tool_calls": 0, "tool_seconds": 0.0, "tokens": 0}
+            )
+            kind = "llm" if span["name"] == "llm_call" else "tool"
+            stage[f"{kind}_calls"] += 1
+            stage[f"{kind}_seconds"] = round(stage[f"{kind}_seconds"] + span["duration"], 4)
+            stage["tokens"] += span.get("prompt_tokens", 0) + span.get("completion_tokens", 0)
+        return totals
+
+    def close(self) -> None:
+        """Stop attributing calls to this run and forget its calls that never completed"""
+        task_ids = set(self._task_ids)
+        with _routes_lock:
+            for task_id in task_ids:
+                _routes.pop(task_id, None)
+        with _pending_lock:
+            for call_id in [call_id for call_id, (_, event, _) in _pending_calls.items() if event.task_id in task_ids]:
+                del _pending_calls[call_id]
+
+    def save(self, status: str, stages: Optional[dict] = None) -> str:
+        self.close()
+        with self._lock:
+            spans = sorted(self._spans, key=lambda span: span["start"])
+        totals = self.summary()
+        document = {
+            "research_id": self.research_id,
+            "status": status,
+            "started_at": datetime.fromtimestamp(self.started).isoformat(),
+            "duration": round(time.time() - self.started, 4),
+            "stages": {
+                key: {"elapsed_seconds": stage.get("elapsed_seconds", 0.0), **totals.get(key, {})}
+                for key, stage in (stages or {}).items()
+            },
+            "spans": spans,
+        }
+        os.makedirs(self.trace_dir, exist_ok=True)
+        path = trace_path(self.research_id, self.trace_dir)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+        return path
+
+
+# --- CrewAI Event Instrumentation ---
+# LLM metrics are recorded for every call in the process; spans only for calls made by a bound task.
+# The bus may deliver a call's start and end on different threads and in either order, so both are
+# parked by call id until the pair is complete.
+_routes: Dict[str, Tuple[RunTrace, str]] = {}
+_routes_lock = threading.Lock()
+_pending_calls: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+_pending_lock = threading.Lock()
+_installed = False
+
+
+def _usage_tokens(usage: Optional[dict]) -> Tuple[int, int]:
+    usage = usage or {}
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens")) or 0
+    completion = usage.get("completion_tokens", usage.get("output_tokens")) or 0
+    return int(prompt), int(completion)
+
+
+def _route(task_id: Optional[str]) -> Optional[Tuple[RunTrace, str]]:
+    if not task_id:
+        return None
+    with _routes_lock:
+        return _routes.get(task_id)
+
+
+def _pair(kind: str, event: Any) -> Optional[Tuple[Any, Any, str]]:
+    """Returns (started, finished, outcome) once both halves of a call have been seen"""
+    now = time.monotonic()
+    with _pending_lock:
+        other = _pending_calls.pop(event.call_id, None)
+        if other is None:
+            _pending_calls[event.call_id] = (kind, event, now)
+            # Oldest first: expire unpaired halves and keep the dict bounded
+            while _pending_calls:
+                _, (_, _, parked) = next(iter(_pending_calls.items()))
+                if now - parked < PENDING_CALL_TTL_SECONDS and len(_pending_calls) <= MAX_PENDING_CALLS:
+                    break
+                _pending_calls.popitem(last=False)
+            return None
+    other_kind, other_event, _ = other
+    if kind == "started":
+        return event, other_event, other_kind
+    return other_event, event, kind
+
+
+def _on_llm_event(kind: str, event: Any) -> None:
+    paired = _pair(kind, event)
+    if paired is None:
+        return
+    started, finished, outcome = paired
+    model = finished.model or started.model or "unknown"
+    start, end = started.timestamp.timestamp(), finished.timestamp.timestamp()
+    LLM_LATENCY.observe(max(0.0, end - start), model=model)
+    attrs: Dict[str, Any] = {"model": model}
+    if outcome == "failed":
+        LLM_ERRORS.inc(model=model)
+        attrs["error"] = True
+    else:
+        prompt, completion = _usage_tokens(finished.usage)
+        LLM_TOKENS.inc(prompt, model=model, kind="prompt")
+        LLM_TOKENS.inc(completion, model=model, kind="completion")
+        attrs.update(prompt_tokens=prompt, completion_tokens=completion)
+
+    route = _route(started.task_id)
+    if route is not None:
+        trace, task_key = route
+        trace.add("llm_call", start, end, task=task_key, **attrs)
+
+
+def _on_tool_event(event: Any, error: bool) -> None:
+    route = _route(event.task_id)
+    if route is None:
+        return
+    trace, task_key = route
+    if error:
+        # Errors carry no start time; a zero-length span still marks where the failure happened
+        start = end = event.timestamp.timestamp()
+    else:
+        start, end = event.started_at.timestamp(), event.finished_at.timestamp()
+    attrs = {"task": task_key, "tool": event.tool_name}
+    if error:
+        attrs["error"] = True
+    elif getattr(event, "from_cache", False):
+        attrs["cached"] = True
+    trace.add("tool_call", start, end, **attrs)
+
+
+def install_instrumentation() -> None:
+    """Subscribe to CrewAI LLM and tool events once per process"""
+    global _installed
+    with _routes_lock:
+        if _installed:
+            return
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.llm_events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+        from crewai.events.types.tool_usage_events import ToolUsageErrorEvent, ToolUsageFinishedEvent
+
+        crewai_event_bus.on(LLMCallStartedEvent)(lambda source, event: _on_llm_event("started", event))
+        crewai_event_bus.on(LLMCallCompletedEvent)(lambda source, event: _on_llm_event("completed", event))
+        crewai_event_bus.on(LLMCallFailedEvent)(lambda source, event: _on_llm_event("failed", event))
+        crewai_event_bus.on(ToolUsageFinishedEvent)(lambda source, event: _on_tool_event(event, error=False))
+        crewai_event_bus.on(ToolUsageErrorEvent)(lambda source, event: _on_tool_event(event, error=True))
+        _installed = True
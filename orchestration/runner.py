@@ -0,0 +1,190 @@
+"""
+Module: Research Job Runner
+Focus: Executing Queued Jobs Identically in the API Process and Standalone Workers
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from crew import TASK_OUTPUT_FILES, build_research_crew, get_output_dir
+from orchestration.artifact_catalog import get_artifact_catalog
+from orchestration.checkpoints import RunCheckpoint
+from orchestration.job_queue import JOB_LEASE_SECONDS, Job, JobQueue
+from orchestration.manuscript_stream import ManuscriptStream
+from orchestration.metrics import RUN_DURATION, TASK_DURATION
+from orchestration.progress import ProgressTracker
+from orchestration.refresh import RefreshBaseline, load_baseline
+from orchestration.run_control import RunControl, register_run
+from orchestration.run_trace import RunTrace
+from orchestration.session_store import save_result
+
+
+class LeaseLost(Exception):
+    """The job's lease lapsed and another claim owns it now; this run's outcome was discarded"""
+
+
+class LeaseKeeper:
+    """
+    Renews a job's lease in the background while its crew is running
+    Once the queue reports that the claim is gone it calls `on_lost`, so the stale crew stops, and stops renewing
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        job: Job,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        on_lost: Optional[Callable[[], None]] = None
+    ):
+        self.queue = queue
+        self.job = job
+        self.lease_seconds = lease_seconds
+        self.on_lost = on_lost
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def mark_lost(self) -> None:
+        if self.lost:
+            return
+        self.lost = True
+        self._stop.set()
+        print(f"Lease on {self.job.research_id} was lost; stopping this run")
+        if self.on_lost is not None:
+            self.on_lost()
+
+    def _run(self) -> None:
+        interval = max(1, self.lease_seconds // 3)
+        while not self._stop.wait(interval):
+            if not self.queue.heartbeat(self.job.research_id, self.job.worker_id, self.lease_seconds, self.job.attempts):
+                self.mark_lost()
+                break
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread = threading.Thread(
+            target=self._run, name=f"lease-{self.job.research_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+
+
+def load_refresh_baseline(queue: JobQueue, job: Job) -> Optional[RefreshBaseline]:
+    """The prior run a refresh job revises; None for a cold run, or when that run's outputs are gone"""
+    base_id = job.payload.get("refresh_from")
+    if not base_id:
+        return None
+    base = queue.get(base_id)
+    baseline = None
+    if base is not None and (base.started_at or base.finished_at):
+        baseline = load_baseline(base_id, get_output_dir(base_id), base.started_at or base.finished_at)
+    if baseline is None:
+        print(f"Outputs of {base_id} are unavailable; {job.research_id} runs as a full research run")
+    return baseline
+
+
+def run_research_job(
+    queue: JobQueue,
+    job: Job,
+    on_update: Optional[Callable[..., None]] = None
+) -> str:
+    """
+    Run the three-task crew for a claimed job and report its outcome to the queue
+    Tasks checkpointed by an earlier attempt are not run again; the crew starts at the first incomplete one.
+    A job whose payload names a `refresh_from` run revises that run's report with newer material only.
+    Progress updates are also passed to `on_update(research_id, **fields)` when given
+    Returns the path of the stored manuscript and re-raises after marking the job failed;
+    a run that is cancelled or overruns a deadline raises RunStopped and ends as "cancelled" or "timed_out".
+    Every write is limited to this worker's claim: a run whose lease was lost stops and raises LeaseLost
+    without touching the job
+    """
+    def report(**fields) -> None:
+        if not queue.update(job.research_id, worker_id=job.worker_id, attempt=job.attempts, **fields):
+            keeper.mark_lost()
+            return
+        if on_update is not None:
+            on_update(job.research_id, **fields)
+
+    def finish(status: str) -> None:
+        RUN_DURATION.observe(time.perf_counter() - started, status=status)
+        for key, stage in tracker.stages.items():
+            if stage["status"] == "completed" and key not in resumed:
+                TASK_DURATION.observe(stage["elapsed_seconds"], task=key)
+        if trace is not None:
+            trace.save(status, tracker.stages)
+
+    started = time.perf_counter()
+    control = None
+    keeper = LeaseKeeper(queue, job, on_lost=lambda: control.cancel() if control is not None else None)
+    report(status="running")
+    tracker = ProgressTracker(report)
+    task_keys = list(TASK_OUTPUT_FILES)
+    checkpoint = RunCheckpoint(job.research_id)
+    resumed = checkpoint.completed(task_keys)
+    if resumed:
+        print(f"Resuming {job.research_id} after {', '.join(resumed)}")
+    stream = None
+    trace = None
+    try:
+        if keeper.lost:
+            raise LeaseLost(f"Lease on {job.research_id} was lost before the run started")
+        with keeper:
+            control = register_run(RunControl(job.research_id, lambda: queue.is_cancel_requested(job.research_id)))
+            stream = ManuscriptStream(job.research_id)
+            trace = RunTrace(job.research_id)
+            tracker.skip(resumed)
+            if len(resumed) == len(task_keys):
+                # Only storing the result failed last time
+                result = checkpoint.output(task_keys[-1])
+            else:
+                with trace.span("build_crew"):
+                    crew = build_research_crew(
+                        job.research_id, progress=tracker, stream=stream, trace=trace, control=control,
+                        checkpoint=checkpoint, refresh=load_refresh_baseline(queue, job)
+                    )
+                tracker.start(task_keys[len(resumed)])
+                control.check()
+                with trace.span("kickoff"):
+                    result = crew.kickoff(inputs={"topic": job.topic})
+        if keeper.lost:
+            raise LeaseLost(f"Lease on {job.research_id} was lost; discarding this run's result")
+        with trace.span("store_result"):
+            result_path = save_result(job.research_id, str(result))
+            get_artifact_catalog().index_run(
+                job.research_id, get_output_dir(job.research_id), job.topic, TASK_OUTPUT_FILES
+            )
+    except Exception as e:
+        if keeper.lost:
+            # The job belongs to another claim now: leave its status, stream log and trace alone
+            if stream is not None:
+                stream.discard()
+            if trace is not None:
+                trace.close()
+            if isinstance(e, LeaseLost):
+                raise
+            raise LeaseLost(f"Lease on {job.research_id} was lost; this run stopped") from e
+        stopped = control.stopped if control is not None else None
+        status = stopped.status if stopped is not None else "failed"
+        if stream is not None:
+            stream.close(status)
+        finish(status)
+        queue.fail(job.research_id, str(stopped or e), status=status, worker_id=job.worker_id, attempt=job.attempts)
+        if stopped is not None:
+            raise stopped from e
+        raise
+    finally:
+        if control is not None:
+            control.close()
+
+    # Record the outcome only once the queue confirms this claim still owns the job
+    if not queue.complete(job.research_id, result_path, worker_id=job.worker_id, attempt=job.attempts):
+        stream.discard()
+        trace.close()
+        raise LeaseLost(f"Lease on {job.research_id} was lost before its result was recorded")
+    stream.close("completed")
+    finish("completed")
+    checkpoint.clear()
+    return result_path
@@ -0,0 +1,116 @@
+"""
+Module: Search Result Cache
+Focus: Cross-Run Reuse of Serper Results with TTL, Bounded Size and Single-Flight Fetches
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from orchestration.disk_cache import DiskCache
+
+# --- Configuration & Environment Management ---
+# Set SEARCH_CACHE_TTL_SECONDS=0 to disable caching and always hit the Serper API.
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join("data", "search_cache.db"))
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", 24 * 60 * 60))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 5000))
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    Disk-backed cache of search responses keyed by normalized query and search parameters
+    Concurrent lookups for the same key inside one process share a single upstream request
+    """
+
+    def __init__(
+        self,
+        path: str = SEARCH_CACHE_PATH,
+        ttl_seconds: int = SEARCH_CACHE_TTL_SECONDS,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._store = DiskCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(query: str, **params: Any) -> str:
+        material = json.dumps({"q": normalize_query(query), **params}, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_or_fetch(self, query: str, fetch: Callable[[], Any], **params: Any) -> Any:
+        if self.ttl_seconds <= 0:
+            self._count("misses")
+            return fetch()
+
+        key = self.make_key(query, **params)
+        cached = self._store.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._in_flight[key] = flight
+                self._counters["misses"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            value = fetch()
+            self._store.set(key, value, label=normalize_query(query))
+            flight.set_result(value)
+            return value
+        except Exception as e:
+            self._count("errors")
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"] + counters["coalesced"]
+        counters.update(
+            entries=self._store.count(),
+            evictions=self._store.evictions,
+            hit_ratio=round((counters["hits"] + counters["coalesced"]) / lookups, 3) if lookups else 0.0,
+        )
+        return counters
+
+    def close(self) -> None:
+        self._store.close()
+
+
+# --- Shared Instance ---
+# One cache per process so every crew's search tool shares hits and in-flight requests.
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+        return _search_cache
@@ -0,0 +1,272 @@
+"""
+Module: Research Session Store
+Focus: Bounded, Indexed Session State with Out-of-Line Result Bodies
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, List, Optional, Tuple, Type
+
+from orchestration.job_queue import TERMINAL_STATUSES
+
+# --- Configuration & Environment Management ---
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", os.path.join("data", "sessions.db"))
+SESSION_STORE_MAX_ENTRIES = int(os.getenv("SESSION_STORE_MAX_ENTRIES", 1000))
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 24 * 60 * 60))
+RESULT_DIR = os.getenv("RESULT_DIR", os.path.join("data", "results"))
+
+
+# --- Result Bodies ---
+# Manuscripts can run to hundreds of kilobytes, so sessions only carry a path to them.
+def save_result(research_id: str, content: str, result_dir: str = RESULT_DIR) -> str:
+    os.makedirs(result_dir, exist_ok=True)
+    path = os.path.join(result_dir, f"{research_id}.md")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_result(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+class SessionStore(ABC):
+    """
+    Backend contract for research session records
+    Sessions are plain dicts keyed by research_id; list() pages newest-first with an optional status filter
+    """
+
+    @abstractmethod
+    def get(self, research_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def put(self, research_id: str, session: dict) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, research_id: str, **fields) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def list(self, status: Optional[str] = None, offset: int = 0, limit: int = 50) -> Tuple[int, List[dict]]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process store with LRU eviction and a TTL for finished sessions
+    In-flight sessions are never evicted; a per-status index keeps filtered listing O(page)
+    """
+
+    def __init__(self, max_entries: int = SESSION_STORE_MAX_ENTRIES, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._sessions: "OrderedDict[str, dict]" = OrderedDict()  # LRU order
+        self._created: "OrderedDict[str, None]" = OrderedDict()  # creation order
+        self._by_status: Dict[str, "OrderedDict[str, None]"] = {}
+        self._finished_at: Dict[str, float] = {}
+
+    def _index(self, research_id: str, old_status: Optional[str], new_status: str) -> None:
+        if old_status == new_status:
+            return
+        if old_status is not None:
+            self._by_status.get(old_status, {}).pop(research_id, None)
+        self._by_status.setdefault(new_status, OrderedDict())[research_id] = None
+        # Pop before re-inserting so a terminal -> terminal move goes to the back and the dict stays in finish order
+        self._finished_at.pop(research_id, None)
+        if new_status in TERMINAL_STATUSES:
+            self._finished_at[research_id] = time.monotonic()
+
+    def _remove(self, research_id: str) -> None:
+        session = self._sessions.pop(research_id)
+        self._created.pop(research_id, None)
+        self._by_status.get(session["status"], {}).pop(research_id, None)
+        self._finished_at.pop(research_id, None)
+
+    def _expired(self, research_id: str) -> bool:
+        finished_at = self._finished_at.get(research_id)
+        return finished_at is not None and time.monotonic() - finished_at > self.ttl_seconds
+
+    def _evict(self) -> None:
+        # _finished_at is kept in completion order, so expired entries are always at the front
+        while self._finished_at:
+            research_id = next(iter(self._finished_at))
+            if not self._expired(research_id):
+                break
+            self._remove(research_id)
+        if len(self._sessions) <= self.max_entries:
+            return
+        for research_id in list(self._sessions):
+            if len(self._sessions) <= self.max_entries:
+                break
+            if self._sessions[research_id]["status"] in TERMINAL_STATUSES:
+                self._remove(research_id)
+
+    def get(self, research_id: str) -> Optional[dict]:
+        with self._lock:
+            if research_id not in self._sessions:
+                return None
+            if self._expired(research_id):
+                self._remove(research_id)
+                return None
+            self._sessions.move_to_end(research_id)
+            return dict(self._sessions[research_id])
+
+    def put(self, research_id: str, session: dict) -> None:
+        with self._lock:
+            old = self._sessions.get(research_id)
+            stored = dict(session, research_id=research_id)
+            self._sessions[research_id] = stored
+            self._sessions.move_to_end(research_id)
+            if old is None:
+                self._created[research_id] = None
+            self._index(research_id, old["status"] if old else None, stored["status"])
+            self._evict()
+
+    def update(self, research_id: str, **fields) -> Optional[dict]:
+        with self._lock:
+            session = self._sessions.get(research_id)
+            if session is None:
+                return None
+            old_status = session["status"]
+            session.update(fields)
+            self._sessions.move_to_end(research_id)
+            self._index(research_id, old_status, session["status"])
+            return dict(session)
+
+    def list(self, status: Optional[str] = None, offset: int = 0, limit: int = 50) -> Tuple[int, List[dict]]:
+        with self._lock:
+            self._evict()
+            index = self._created if status is None else self._by_status.get(status, OrderedDict())
+            page = islice(reversed(index), offset, offset + limit)
+            return len(index), [dict(self._sessions[rid]) for rid in page]
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Persistent store for long-lived deployments and multi-process setups
+    Indexed columns back filtering and paging; remaining fields live in a JSON column
+    """
+
+    _COLUMNS = ("research_id", "topic", "status", "progress", "current_agent", "started_at")
+
+    def __init__(self, path: str = SESSION_STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                research_id   TEXT PRIMARY KEY,
+                topic         TEXT NOT NULL,
+                status        TEXT NOT NULL,
+                progress      INTEGER NOT NULL DEFAULT 0,
+                current_agent TEXT,
+                started_at    TEXT NOT NULL,
+                extra         TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions (started_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_status_started ON sessions (status, started_at)")
+
+    def _row_to_session(self, row: sqlite3.Row) -> dict:
+        session = json.loads(row["extra"])
+        session.update({name: row[name] for name in self._COLUMNS})
+        return session
+
+    def _write(self, research_id: str, session: dict) -> None:
+        extra = {key: value for key, value in session.items() if key not in self._COLUMNS}
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (research_id, topic, status, progress, current_agent, started_at, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                research_id,
+                session["topic"],
+                session["status"],
+                session.get("progress", 0),
+                session.get("current_agent"),
+                session["started_at"],
+                json.dumps(extra),
+            ),
+        )
+
+    def get(self, research_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sessions WHERE research_id = ?", (research_id,)).fetchone()
+        return self._row_to_session(row) if row else None
+
+    def put(self, research_id: str, session: dict) -> None:
+        with self._lock:
+            self._write(research_id, session)
+
+    def update(self, research_id: str, **fields) -> Optional[dict]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT * FROM sessions WHERE research_id = ?", (research_id,)).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                session = self._row_to_session(row)
+                session.update(fields)
+                self._write(research_id, session)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return session
+
+    def list(self, status: Optional[str] = None, offset: int = 0, limit: int = 50) -> Tuple[int, List[dict]]:
+        where, params = ("WHERE status = ?", (status,)) if status else ("", ())
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM sessions {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM sessions {where} ORDER BY started_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return total, [self._row_to_session(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# --- Backend Registry ---
+_BACKENDS: Dict[str, Type[SessionStore]] = {
+    "memory": MemorySessionStore,
+    "sqlite": SQLiteSessionStore,
+}
+
+
+def register_session_store_backend(name: str, backend: Type[SessionStore]) -> None:
+    _BACKENDS[name] = backend
+
+
+def create_session_store(backend: str = SESSION_STORE_BACKEND, **kwargs) -> SessionStore:
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown session store backend: {backend!r} (available: {sorted(_BACKENDS)})")
+    return _BACKENDS[backend](**kwargs)
@@ -0,0 +1,74 @@
+"""
+Module: Research Worker Pool
+Focus: Bounded Concurrency for Crew Execution
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+# --- Configuration & Environment Management ---
+# Concurrency limits are environment-driven so each deployment can size the pool to its LLM quota.
+MAX_CONCURRENT_RESEARCH = int(os.getenv("MAX_CONCURRENT_RESEARCH", 2))
+MAX_QUEUED_RESEARCH = int(os.getenv("MAX_QUEUED_RESEARCH", 20))
+
+
+class WorkerPoolFull(Exception):
+    """Raised when the pool has no running slot or queue position left"""
+
+
+class ResearchWorkerPool:
+    """
+    Fixed-size thread pool for crew kickoffs
+    Runs at most `max_workers` crews at once and rejects work beyond `max_queued` waiting jobs
+    """
+
+    def __init__(self, max_workers: int = MAX_CONCURRENT_RESEARCH, max_queued: int = MAX_QUEUED_RESEARCH):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="research-worker")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queued:
+                raise WorkerPoolFull(
+                    f"Research capacity exhausted ({self.max_workers} running, {self.max_queued} queued)"
+                )
+            self._pending += 1
+
+        def run() -> Any:
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+
+        try:
+            return self._executor.submit(run)
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return self._pending < self.max_workers
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "running": self._running,
+                "queued": self._pending - self._running,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
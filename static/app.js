@@ -10,7 +10,9 @@ const WS_BASE_URL = API_BASE_URL.replace('http', 'ws');
 
 // === State Management ===
 let currentResearchId = null;
+let resultsResearchId = null;
 let websocket = null;
+let manuscriptStream = null;
 
 // === DOM Elements ===
 const elements = {
@@ -22,6 +24,8 @@ const elements = {
     progressBar: document.getElementById('progressBar'),
     progressPercentage: document.getElementById('progressPercentage'),
     progressStatus: document.getElementById('progressStatus'),
+    cancelResearchBtn: document.getElementById('cancelResearchBtn'),
+    manuscriptPreview: document.getElementById('manuscriptPreview'),
     resultsSection: document.getElementById('resultsSection'),
     apiStatusBtn: document.getElementById('apiStatusBtn'),
     apiStatusIndicator: document.getElementById('apiStatusIndicator'),
@@ -49,6 +53,9 @@ function setupEventListeners() {
     // Start research button
     elements.startResearchBtn.addEventListener('click', startResearch);
 
+    // Cancel research button
+    elements.cancelResearchBtn.addEventListener('click', cancelResearch);
+
     // API status button
     elements.apiStatusBtn.addEventListener('click', checkAPIHealth);
 
@@ -63,6 +70,19 @@ function setupEventListeners() {
             startResearch();
         }
     });
+
+    // Archive search: Enter searches, clearing the box goes back to the full list
+    const archiveSearch = document.getElementById('archiveSearch');
+    if (archiveSearch) {
+        archiveSearch.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter') {
+                searchArchive(archiveSearch.value.trim());
+            }
+        });
+        archiveSearch.addEventListener('search', () => {
+            if (!archiveSearch.value.trim()) loadArchive();
+        });
+    }
 }
 
 // === Character Counter ===
@@ -149,18 +169,16 @@ async function startResearch() {
         const data = await response.json();
         currentResearchId = data.research_id;
 
-        showToast('🚀 Research initiated successfully', 'success');
+        showToast(data.deduplicated ? `♻️ ${data.message}` : '🚀 Research initiated successfully', 'success');
 
         // Show agent cards and progress
         showAgentCards();
         showProgressSection();
         hideResultsSection();
 
-        // Connect to WebSocket for real-time updates
+        // Connect to WebSocket for real-time updates (falls back to polling if it drops)
         connectWebSocket(currentResearchId);
-
-        // Start polling as fallback
-        startPolling(currentResearchId);
+        connectManuscriptStream(currentResearchId);
 
     } catch (error) {
         showToast(`❌ Error: ${error.message}`, 'error');
@@ -169,6 +187,25 @@ async function startResearch() {
     }
 }
 
+// === Cancel Research ===
+async function cancelResearch() {
+    if (!currentResearchId) return;
+
+    elements.cancelResearchBtn.disabled = true;
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/research/${currentResearchId}`, { method: 'DELETE' });
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.detail || 'Failed to cancel research');
+        }
+        // The final "cancelled" status arrives over the WebSocket once the crew has stopped
+        showToast(`🛑 ${data.message}`, 'info');
+    } catch (error) {
+        showToast(`❌ Error: ${error.message}`, 'error');
+        elements.cancelResearchBtn.disabled = false;
+    }
+}
+
 // === WebSocket Connection ===
 function connectWebSocket(researchId) {
     try {
@@ -190,9 +227,15 @@ function connectWebSocket(researchId) {
 
         websocket.onclose = () => {
             console.log('WebSocket disconnected');
+
+            // Server closes the socket itself after the final update; anything earlier means we lost the push feed
+            if (currentResearchId === researchId) {
+                startPolling(researchId);
+            }
         };
     } catch (error) {
         console.error('WebSocket connection failed:', error);
+        startPolling(researchId);
     }
 }
 
@@ -200,6 +243,8 @@ function connectWebSocket(researchId) {
 let pollingInterval = null;
 
 function startPolling(researchId) {
+    if (pollingInterval) return;
+
     pollingInterval = setInterval(async () => {
         try {
             const response = await fetch(`${API_BASE_URL}/api/research/status/${researchId}`);
@@ -207,7 +252,7 @@ function startPolling(researchId) {
 
             updateProgress(data);
 
-            if (data.status === 'completed' || data.status === 'failed') {
+            if (['completed', 'failed', 'cancelled', 'timed_out'].includes(data.status)) {
                 stopPolling();
             }
         } catch (error) {
@@ -233,7 +278,9 @@ function updateProgress(data) {
 
     // Update status message
     if (current_agent) {
-        elements.progressStatus.textContent = `${current_agent} is working...`;
+        const stage = data.stages && data.current_task ? data.stages[data.current_task] : null;
+        const detail = stage ? ` (${stage.llm_turns} LLM turns, ${stage.tool_calls} tool calls, ${Math.round(stage.elapsed_seconds)}s)` : '';
+        elements.progressStatus.textContent = `${current_agent} is working...${detail}`;
         updateAgentStatus(current_agent, 'active');
     } else {
         elements.progressStatus.textContent = data.message || 'Processing...';
@@ -244,6 +291,8 @@ function updateProgress(data) {
         handleResearchComplete();
     } else if (status === 'failed') {
         handleResearchFailed(data.error || 'Unknown error');
+    } else if (status === 'cancelled' || status === 'timed_out') {
+        handleResearchFailed(data.error || `Research ${status.replace('_', ' ')}`);
     }
 }
 
@@ -275,8 +324,55 @@ function updateAgentStatus(agentName, status) {
     }
 }
 
+// === Live Manuscript Stream ===
+// EventSource resends the last event id (a byte offset) on reconnect, so the draft resumes without gaps
+function connectManuscriptStream(researchId) {
+    closeManuscriptStream();
+    elements.manuscriptPreview.textContent = '';
+    elements.manuscriptPreview.style.display = 'none';
+
+    const drafts = {};
+    manuscriptStream = new EventSource(`${API_BASE_URL}/api/research/stream/${researchId}`);
+    manuscriptStream.addEventListener('chunks', (event) => {
+        let latestTask = null;
+        JSON.parse(event.data).forEach(record => {
+            if (record.type === 'call') {
+                drafts[record.task] = '';
+            } else if (record.type === 'chunk') {
+                drafts[record.task] = (drafts[record.task] || '') + record.text;
+                latestTask = record.task;
+            } else if (record.type === 'end') {
+                closeManuscriptStream();
+            }
+        });
+        if (latestTask) {
+            renderDraft(drafts[latestTask]);
+        }
+    });
+}
+
+function renderDraft(text) {
+    // Agents think out loud before answering; only the answer itself is worth showing
+    const marker = text.indexOf('Final Answer:');
+    const preview = elements.manuscriptPreview;
+    const atBottom = preview.scrollTop + preview.clientHeight >= preview.scrollHeight - 20;
+    preview.textContent = marker >= 0 ? text.slice(marker + 'Final Answer:'.length).trimStart() : text;
+    preview.style.display = 'block';
+    if (atBottom) {
+        preview.scrollTop = preview.scrollHeight;
+    }
+}
+
+function closeManuscriptStream() {
+    if (manuscriptStream) {
+        manuscriptStream.close();
+        manuscriptStream = null;
+    }
+}
+
 // === Handle Research Complete ===
 function handleResearchComplete() {
+    const researchId = currentResearchId;
     showToast('✅ Research completed successfully!', 'success');
 
     // Mark all agents as completed
@@ -288,24 +384,30 @@ function handleResearchComplete() {
         }
     });
 
-    // Hide progress, show results
+    // Hide progress, show results; the run ID stays set until its results card can download from it
     setTimeout(() => {
         hideProgressSection();
-        showResultsSection();
+        showResultsSection(researchId);
+        if (currentResearchId === researchId) {
+            currentResearchId = null;
+        }
         resetUI();
         loadArchive();
     }, 1500);
 
-    // Close WebSocket
+    // Close WebSocket (a finished run needs no polling fallback)
     if (websocket) {
+        websocket.onclose = null;
         websocket.close();
     }
+    closeManuscriptStream();
 
     stopPolling();
 }
 
 // === Handle Research Failed ===
 function handleResearchFailed(error) {
+    currentResearchId = null;
     showToast(`❌ Research failed: ${error}`, 'error');
 
     setTimeout(() => {
@@ -317,6 +419,7 @@ function handleResearchFailed(error) {
     if (websocket) {
         websocket.close();
     }
+    closeManuscriptStream();
 
     stopPolling();
 }
@@ -326,20 +429,19 @@ async function downloadFile(filename) {
     try {
         showToast(`📥 Downloading ${filename}...`, 'info');
 
-        const response = await fetch(`${API_BASE_URL}/api/research/results/${filename}`);
+        // Raw mode streams compressed bytes and revalidates repeat downloads via ETag
+        const response = await fetch(`${API_BASE_URL}/api/research/results/${filename}?raw=true`, { cache: 'no-cache' });
 
         if (!response.ok) {
             throw new Error('File not found');
         }
 
-        const data = await response.json();
-
         // Create download link
-        const blob = new Blob([data.content], { type: 'text/markdown' });
+        const blob = await response.blob();
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;
-        a.download = filename;
+        a.download = filename.split('/').pop();
         document.body.appendChild(a);
         a.click();
         window.URL.revokeObjectURL(url);
@@ -352,6 +454,15 @@ async function downloadFile(filename) {
     }
 }
 
+// Results card buttons: files of the run that just completed, under outputs/<research_id>/
+function downloadResult(filename) {
+    if (!resultsResearchId) {
+        showToast('❌ No completed research to download from', 'error');
+        return;
+    }
+    downloadFile(`${resultsResearchId}/${filename}`);
+}
+
 // === UI Helper Functions ===
 function showAgentCards() {
     elements.agentsGrid.style.display = 'grid';
@@ -365,13 +476,15 @@ function hideAgentCards() {
 function showProgressSection() {
     elements.progressSection.style.display = 'block';
     elements.progressSection.classList.add('fade-in');
+    elements.cancelResearchBtn.disabled = false;
 }
 
 function hideProgressSection() {
     elements.progressSection.style.display = 'none';
 }
 
-function showResultsSection() {
+function showResultsSection(researchId) {
+    resultsResearchId = researchId;
     elements.resultsSection.style.display = 'block';
     elements.resultsSection.classList.add('fade-in');
 }
@@ -491,6 +604,79 @@ async function loadArchive() {
     }
 }
 
+// === Archive Search ===
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+async function searchArchive(query) {
+    const grid = document.getElementById('archiveGrid');
+    if (!grid) return;
+    if (!query) {
+        loadArchive();
+        return;
+    }
+
+    try {
+        grid.innerHTML = '<div style="grid-column: 1/-1; text-align: center; padding: 2rem; color: var(--text-muted);">Searching...</div>';
+
+        const response = await fetch(`${API_BASE_URL}/api/manuscripts/search?q=${encodeURIComponent(query)}`);
+
+        if (!response.ok) throw new Error('Search failed');
+
+        const data = await response.json();
+
+        grid.innerHTML = '';
+
+        if (data.results.length === 0) {
+            grid.innerHTML = '<div style="grid-column: 1/-1; text-align: center; padding: 2rem; color: var(--text-muted);">No matching manuscripts.</div>';
+            return;
+        }
+
+        data.results.forEach(hit => {
+            const item = document.createElement('div');
+            item.className = 'result-item';
+
+            // Snippets mark matched terms with <mark>; everything else is shown as plain text
+            const snippet = escapeHtml(hit.snippet)
+                .replace(/&lt;mark&gt;/g, '<mark>')
+                .replace(/&lt;\/mark&gt;/g, '</mark>');
+
+            item.innerHTML = `
+                <div class="result-icon">🔎</div>
+                <div class="result-info">
+                    <h4 class="result-title" style="word-break: break-all;">${escapeHtml(hit.filename)}</h4>
+                    <p class="result-description">${snippet}</p>
+                    <p class="result-description">
+                        ${escapeHtml(hit.topic)} • ${new Date(hit.created_at).toLocaleString()}
+                    </p>
+                </div>
+                <button class="btn-download" onclick="downloadFile('${hit.filename}')">
+                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
+                        <polyline points="7 10 12 15 17 10"></polyline>
+                        <line x1="12" y1="15" x2="12" y2="3"></line>
+                    </svg>
+                    Download
+                </button>
+            `;
+            grid.appendChild(item);
+        });
+
+        if (data.total > data.results.length) {
+            showToast(`Showing top ${data.results.length} of ${data.total} matches`, 'info');
+        }
+
+    } catch (error) {
+        console.error('Failed to search archive:', error);
+        showToast('⚠️ Could not search archive', 'error');
+    }
+}
+
 // === Export for global access ===
 window.downloadFile = downloadFile;
+window.downloadResult = downloadResult;
 window.loadArchive = loadArchive;
+window.searchArchive = searchArchive;
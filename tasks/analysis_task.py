@@ -4,16 +4,18 @@ PhD-Level Rigor | Industry Standard
 Focus: Meta-Analysis & Statistical Synthesis
 """
 
+import os
 import textwrap
-from crewai import Task
-from agents.data_analyst import data_analyst_agent
-from tasks.research_task import research_task
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+
+ANALYSIS_OUTPUT_FILE = "analysis_report.md"
 
 # --- Task Configuration ---
 # Implements advanced analytical protocols: pattern recognition, causal inference, and meta-synthesis
-analysis_task = Task(
-    agent=data_analyst_agent,
-    description=textwrap.dedent("""
+ANALYSIS_DESCRIPTION = textwrap.dedent("""
                 Perform meta-analytical synthesis and statistical validation on: {topic}
 
                 Analytical Protocol (Quantitative & Qualitative Rigor):
@@ -29,8 +31,44 @@ analysis_task = Task(
                 - **Causal Inference**: Mechanistic explanations and dependency mapping
                 - **Statistical Validation**: Confidence metrics, effect sizes, and significance testing
                 - **Strategic Implications**: Actionable insights with risk-benefit analysis
-                """),
-    expected_output="A rigorous meta-analytical report with pattern identification, trend dynamics, causal inference, statistical validation, and strategic implications",
-    context=[research_task],
-    output_file="analysis_report.md"
-)
\ No newline at end of file
+                """)
+
+ANALYSIS_EXPECTED_OUTPUT = "A rigorous meta-analytical report with pattern identification, trend dynamics, causal inference, statistical validation, and strategic implications"
+
+
+# --- Incremental Refresh ---
+# The analyst revises the prior report with the new findings instead of re-deriving it
+ANALYSIS_REFRESH_DESCRIPTION = textwrap.dedent("""
+                Revise the existing meta-analytical report on: {topic}
+                """)
+ANALYSIS_REFRESH_PROTOCOL = textwrap.dedent("""
+                Revision Protocol (Incremental Update):
+                1. Start from the Prior Analysis Report; it reflects the literature up to {since}
+                2. Integrate the New Research Findings published since {since}
+                3. Update only the patterns, trends, causal claims and statistics the new evidence confirms, extends or overturns
+                4. Keep every unaffected section and its citations as written
+                5. Flag each revised conclusion and state what changed it
+
+                Deliverable: the complete revised report in the original structure, not just the changes
+                """)
+
+
+def create_analysis_task(
+    agent: "Agent",
+    research_task: "Task",
+    output_dir: str,
+    refresh_since: Optional[str] = None
+) -> "Task":
+    """`refresh_since` turns the task into a revision of the prior run's analysis"""
+    from crewai import Task
+
+    description = ANALYSIS_DESCRIPTION
+    if refresh_since is not None:
+        description = ANALYSIS_REFRESH_DESCRIPTION + ANALYSIS_REFRESH_PROTOCOL.format(since=refresh_since)
+    return Task(
+        agent=agent,
+        description=description,
+        expected_output=ANALYSIS_EXPECTED_OUTPUT,
+        context=[research_task],
+        output_file=os.path.join(output_dir, ANALYSIS_OUTPUT_FILE)
+    )
\ No newline at end of file
@@ -4,15 +4,20 @@ PhD-Level Rigor | Industry Standard
 Focus: Systematic Literature Review & Empirical Data Acquisition
 """
 
+import os
 import textwrap
-from crewai import Task
-from agents.research_specialist import research_specialist_agent
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+
+RESEARCH_OUTPUT_FILE = "research_findings.md"
+# Refresh runs write only the new material here; the cumulative findings still go to RESEARCH_OUTPUT_FILE
+RESEARCH_UPDATES_FILE = "research_updates.md"
 
 # --- Task Configuration ---
 # Defines the systematic research protocol following PRISMA-like methodology
-research_task = Task(
-    agent=research_specialist_agent,
-    description=textwrap.dedent("""
+RESEARCH_DESCRIPTION = textwrap.dedent("""
                 Execute a systematic literature review and empirical data acquisition on: {topic}
 
                 Research Protocol (Methodological Rigor):
@@ -28,7 +33,72 @@ research_task = Task(
                 - **Expert Consensus**: Peer-reviewed opinions and industry thought leadership
                 - **Temporal Analysis**: Recent developments, emerging trends, and trajectory forecasts
                 - **Source Provenance**: Full bibliographic references with credibility assessment
-                """),
-    expected_output="A systematic research synthesis with empirical evidence, statistical validation, expert consensus, temporal analysis, and full source provenance",
-    output_file="research_findings.md"
-)
\ No newline at end of file
+                """)
+
+RESEARCH_EXPECTED_OUTPUT = "A systematic research synthesis with empirical evidence, statistical validation, expert consensus, temporal analysis, and full source provenance"
+
+
+def create_research_task(agent: "Agent", output_dir: str) -> "Task":
+    from crewai import Task
+
+    return Task(
+        agent=agent,
+        description=RESEARCH_DESCRIPTION,
+        expected_output=RESEARCH_EXPECTED_OUTPUT,
+        output_file=os.path.join(output_dir, RESEARCH_OUTPUT_FILE)
+    )
+
+
+# --- Parallel Research Facets ---
+# In fan-out mode the topic is split into these sub-questions, each researched concurrently by its own agent
+RESEARCH_FACETS = (
+    ("foundations", "Foundations & State of the Art", "core definitions, established theory and the current state of the art"),
+    ("evidence", "Quantitative Evidence", "empirical studies, statistics, benchmarks and measured outcomes"),
+    ("developments", "Recent Developments", "developments from the last two years, emerging trends and forecasts"),
+    ("applications", "Applications & Case Studies", "real-world deployments, industry adoption and documented case studies"),
+    ("challenges", "Challenges & Open Questions", "limitations, risks, controversies and unresolved research questions"),
+    ("landscape", "Key Actors & Sources", "leading institutions, researchers, companies and authoritative reference sources"),
+)
+
+RESEARCH_FACET_FOCUS = textwrap.dedent("""
+                Parallel Research Stream: {facet_title}
+                Restrict this stream to {facet_focus}.
+                Sibling streams cover the other angles concurrently, so do not repeat general background.
+                """)
+
+
+def create_research_subtask(agent: "Agent", output_dir: str, facet: tuple) -> "Task":
+    from crewai import Task
+
+    key, title, focus = facet
+    return Task(
+        agent=agent,
+        description=RESEARCH_DESCRIPTION + RESEARCH_FACET_FOCUS.format(facet_title=title, facet_focus=focus),
+        expected_output=f"{RESEARCH_EXPECTED_OUTPUT}, limited to {focus}",
+        async_execution=True,
+        output_file=os.path.join(output_dir, f"research_{key}.md")
+    )
+
+# --- Incremental Refresh ---
+# A refresh run searches only for what appeared after the prior run and reports just the delta
+RESEARCH_REFRESH_FOCUS = textwrap.dedent("""
+                Incremental Refresh (prior review searched on {since}):
+                Search only for material published after {since}. Older results and sources the prior review
+                already cited are removed from search results, so do not look for them elsewhere.
+                Sources already cited (do not report them again):
+                {known_sources}
+                Report only findings that are new or that change the prior review's conclusions, each with its source.
+                If nothing material has changed, say so in one short paragraph.
+                """)
+
+
+def create_research_refresh_task(agent: "Agent", output_dir: str, since: str, known_sources: Sequence[str]) -> "Task":
+    from crewai import Task
+
+    listed = "\n".join(f"- {url}" for url in known_sources) or "- (none recorded)"
+    return Task(
+        agent=agent,
+        description=RESEARCH_DESCRIPTION + RESEARCH_REFRESH_FOCUS.format(since=since, known_sources=listed),
+        expected_output=f"Only the findings published since {since} that are new or change the prior conclusions, with full source provenance",
+        output_file=os.path.join(output_dir, RESEARCH_UPDATES_FILE)
+    )
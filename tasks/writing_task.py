@@ -4,17 +4,18 @@ PhD-Level Rigor | Industry Standard
 Focus: Scholarly Manuscript Production & Technical Documentation
 """
 
+import os
 import textwrap
-from crewai import Task
-from agents.content_writer import content_writer_agent
-from tasks.analysis_task import analysis_task
-from tasks.research_task import research_task
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+
+WRITING_OUTPUT_FILE = "final_report.md"
 
 # --- Task Configuration ---
 # Produces publication-ready manuscripts adhering to academic and industry standards
-writing_task = Task(
-    agent=content_writer_agent,
-    description=textwrap.dedent("""
+WRITING_DESCRIPTION = textwrap.dedent("""
                 Produce a publication-ready research manuscript on: {topic}
 
                 Writing Protocol (Academic & Executive Standards):
@@ -32,8 +33,45 @@ writing_task = Task(
                 - **Analysis & Discussion**: Interpretation, implications, and theoretical contributions
                 - **Conclusions & Recommendations**: Strategic insights with actionable pathways
                 - **References**: Full bibliographic citations with DOI/URL provenance
-                """),
-    expected_output="A publication-ready manuscript with executive summary, IMRAD structure, statistical validation, strategic recommendations, and full bibliographic references",
-    context=[research_task, analysis_task],
-    output_file="final_report.md"
-)
\ No newline at end of file
+                """)
+
+WRITING_EXPECTED_OUTPUT = "A publication-ready manuscript with executive summary, IMRAD structure, statistical validation, strategic recommendations, and full bibliographic references"
+
+
+# --- Incremental Refresh ---
+# The writer edits the existing manuscript rather than drafting a new one
+WRITING_REFRESH_DESCRIPTION = textwrap.dedent("""
+                Revise the existing research manuscript on: {topic}
+                """)
+WRITING_REFRESH_PROTOCOL = textwrap.dedent("""
+                Revision Protocol (Incremental Update):
+                1. Start from the Existing Manuscript; it covers the literature up to {since}
+                2. Integrate the New Research Findings and the Revised Analysis Report
+                3. Rewrite only the passages the new evidence affects; keep all other text and citations unchanged
+                4. Update the Executive Summary and Conclusions where the findings moved
+                5. Add the new sources to the References and state in the Methodology that the review was updated with material since {since}
+
+                Deliverable: the complete revised manuscript in the original structure
+                """)
+
+
+def create_writing_task(
+    agent: "Agent",
+    research_task: "Task",
+    analysis_task: "Task",
+    output_dir: str,
+    refresh_since: Optional[str] = None
+) -> "Task":
+    """`refresh_since` turns the task into a revision of the prior run's manuscript"""
+    from crewai import Task
+
+    description = WRITING_DESCRIPTION
+    if refresh_since is not None:
+        description = WRITING_REFRESH_DESCRIPTION + WRITING_REFRESH_PROTOCOL.format(since=refresh_since)
+    return Task(
+        agent=agent,
+        description=description,
+        expected_output=WRITING_EXPECTED_OUTPUT,
+        context=[research_task, analysis_task],
+        output_file=os.path.join(output_dir, WRITING_OUTPUT_FILE)
+    )
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Standalone research worker pool
+Claims jobs from the durable queue and runs the three-task crew in separate processes
+
+Usage: python worker.py --processes 4
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+
+WORKER_PROCESSES = int(os.getenv("RESEARCH_WORKER_PROCESSES", 1))
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", 2))
+# Worker N serves Prometheus metrics on WORKER_METRICS_PORT + N; 0 disables
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", 0))
+
+
+def worker_loop(index: int, stop_event) -> None:
+    """
+    Claim and execute jobs until the parent asks this process to stop
+    A job that is already running is always finished before exiting
+    """
+    # The parent handles Ctrl+C and drains workers through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from crew import warm_up
+    from orchestration.job_queue import create_job_queue
+    from orchestration.metrics import start_metrics_server
+    from orchestration.runner import run_research_job
+
+    if WORKER_METRICS_PORT:
+        start_metrics_server(WORKER_METRICS_PORT + index)
+    queue = create_job_queue()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    # Load the crew engine before claiming anything so the first job's lease is not spent on imports
+    print(f"Worker {index} started as {worker_id}; engine warmed in {warm_up()['seconds']}s")
+
+    try:
+        while not stop_event.is_set():
+            job = queue.claim(worker_id)
+            if job is None:
+                stop_event.wait(WORKER_POLL_SECONDS)
+                continue
+
+            print(f"Worker {index} running {job.research_id} (attempt {job.attempts})")
+            try:
+                run_research_job(queue, job)
+                print(f"Worker {index} completed {job.research_id}")
+            except Exception as e:
+                print(f"Worker {index} failed {job.research_id}: {e}")
+    finally:
+        queue.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run research worker processes")
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES, help="Number of worker processes")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+
+    def request_stop(signum, frame):
+        print("Stopping workers after their current jobs...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    processes = [
+        context.Process(target=worker_loop, args=(index, stop_event), name=f"research-worker-{index}")
+        for index in range(max(1, args.processes))
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()